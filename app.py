@@ -1,62 +1,85 @@
 import wx
 import os
+import time
 import shutil
 import datetime
-from project_manager import load_projects, save_projects
+import threading
+from project_manager import load_projects, save_projects, scan_projects, PROJECTS_FILE
 from love_runner import run_love_project
-from PIL import Image
-import yaml
+from catalog import get_catalog
+from exporter import export_project, read_project_meta
+import tracing
 import platform
-import zipfile
-import subprocess
-import glob
-import sys
 
-LIBS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'libs')
-RUNTIMES_PATH = os.path.join(os.path.dirname(os.path.abspath(sys.executable)), 'runtimes')
+# PIL, yaml and hot_reload are imported where they are
+# used so the main window can paint before they are loaded.
+
 CURRENT_OS = platform.system().lower()
 
 def get_available_libs():
     """Get list of available libraries from the libs directory"""
-    if not os.path.exists(LIBS_PATH):
-        return []
-    return [d for d in os.listdir(LIBS_PATH) 
-            if os.path.isdir(os.path.join(LIBS_PATH, d))]
+    return get_catalog().libs()
 
 def get_lib_files(lib_name, target_os):
     """Get list of library files for a specific library and OS"""
-    lib_path = os.path.join(LIBS_PATH, lib_name, target_os.lower())
-    if not os.path.exists(lib_path):
-        return []
-    return [f for f in os.listdir(lib_path) 
-            if os.path.isfile(os.path.join(lib_path, f))]
+    return [f.name for f in get_catalog().lib_files(lib_name, target_os)]
 
 def get_available_runtimes():
     """Get list of available Love2D runtime versions"""
-    if not os.path.exists(RUNTIMES_PATH):
-        return []
-    return [d for d in os.listdir(RUNTIMES_PATH) 
-            if os.path.isdir(os.path.join(RUNTIMES_PATH, d))]
+    return get_catalog().runtime_versions()
 
 def get_available_platforms(version):
     """Get list of available platforms for a specific Love2D version"""
-    version_path = os.path.join(RUNTIMES_PATH, version)
-    if not os.path.exists(version_path):
-        return []
-    return [d for d in os.listdir(version_path) 
-            if os.path.isdir(os.path.join(version_path, d))]
+    return get_catalog().runtime_platforms(version)
 
 class ProjectManagerFrame(wx.Frame):
     def __init__(self):
         super().__init__(None, title="HeartCore - Love2D Project Manager", size=(800, 500))
-        self.projects = load_projects()
+        # Projects are loaded in the background so the window paints first
+        self.projects = []
         self.selected_index = None
+        self.dev_sessions = {}
+        self.launch_groups = []
+        self.closing = False
         self.InitUI()
         self.Center()
         self.Show()
+        threading.Thread(target=self.LoadProjects, daemon=True).start()
+
+    def LoadProjects(self):
+        try:
+            projects = load_projects()
+        except Exception as e:
+            wx.CallAfter(self.OnProjectsLoadFailed, e)
+            return
+        wx.CallAfter(self.OnProjectsLoaded, projects)
+
+    def OnProjectsLoadFailed(self, error):
+        answer = wx.MessageBox(f"Could not read {PROJECTS_FILE}:\n{str(error)}\n\n"
+                               f"Start with an empty project list? The unreadable file will be kept as "
+                               f"{os.path.basename(PROJECTS_FILE)}.bak.",
+                               "Project List Error", wx.YES_NO | wx.ICON_ERROR)
+        if answer != wx.YES:
+            # Keep registry actions disabled so the broken file is not overwritten
+            self.SetStatusText("Project list could not be read; registry actions are disabled")
+            return
+        try:
+            os.replace(PROJECTS_FILE, PROJECTS_FILE + ".bak")
+        except OSError as e:
+            wx.MessageBox(f"Could not move the project list aside: {str(e)}", "Project List Error",
+                          wx.OK | wx.ICON_ERROR)
+            return
+        self.OnProjectsLoaded([])
+
+    def OnProjectsLoaded(self, projects):
+        self.projects = projects
+        self.RefreshList(self.search_ctrl.GetValue())
+        # Actions that save the registry stay disabled until it has been read
+        for btn in self.registry_buttons:
+            btn.Enable()
 
     def InitUI(self):
-        panel = wx.Panel(self)
+        panel = self.panel = wx.Panel(self)
         vbox = wx.BoxSizer(wx.VERTICAL)
 
         # Top bar
@@ -83,17 +106,35 @@ class ProjectManagerFrame(wx.Frame):
         hbox_right = wx.BoxSizer(wx.HORIZONTAL)
         self.edit_btn = wx.Button(panel, label="Edit")
         self.run_btn = wx.Button(panel, label="Run")
+        self.dev_run_btn = wx.Button(panel, label="Dev Run")
+        self.multi_run_btn = wx.Button(panel, label="Run N...")
         self.rename_btn = wx.Button(panel, label="Rename")
         self.remove_btn = wx.Button(panel, label="Remove")
         self.export_btn = wx.Button(panel, label="Export")
         hbox_right.Add(self.edit_btn, 0, wx.RIGHT, 5)
         hbox_right.Add(self.run_btn, 0, wx.RIGHT, 5)
+        hbox_right.Add(self.dev_run_btn, 0, wx.RIGHT, 5)
+        hbox_right.Add(self.multi_run_btn, 0, wx.RIGHT, 5)
         hbox_right.Add(self.rename_btn, 0, wx.RIGHT, 5)
         hbox_right.Add(self.remove_btn, 0, wx.RIGHT, 5)
         hbox_right.Add(self.export_btn, 0)
         vbox.Add(hbox_right, 0, wx.ALIGN_RIGHT | wx.ALL, 8)
 
         panel.SetSizer(vbox)
+        self.CreateStatusBar()
+
+        # Tools menu
+        menu_bar = wx.MenuBar()
+        tools_menu = wx.Menu()
+        self.trace_item = tools_menu.AppendCheckItem(wx.ID_ANY, "Record Trace",
+                                                     "Record timing spans of scans, exports and saves")
+        self.trace_item.Check(tracing.is_enabled())
+        analyze_item = tools_menu.Append(wx.ID_ANY, "Analyze Export...",
+                                         "Break down the size of an exported .love or executable")
+        compare_item = tools_menu.Append(wx.ID_ANY, "Compare Exports...",
+                                         "Show what grew between two exports")
+        menu_bar.Append(tools_menu, "Tools")
+        self.SetMenuBar(menu_bar)
 
         # Bindings
         self.create_btn.Bind(wx.EVT_BUTTON, self.OnCreate)
@@ -103,9 +144,20 @@ class ProjectManagerFrame(wx.Frame):
         self.project_list.Bind(wx.EVT_LIST_ITEM_SELECTED, self.OnSelect)
         self.edit_btn.Bind(wx.EVT_BUTTON, self.OnEdit)
         self.run_btn.Bind(wx.EVT_BUTTON, self.OnRun)
+        self.dev_run_btn.Bind(wx.EVT_BUTTON, self.OnDevRun)
+        self.multi_run_btn.Bind(wx.EVT_BUTTON, self.OnMultiRun)
         self.rename_btn.Bind(wx.EVT_BUTTON, self.OnRename)
         self.remove_btn.Bind(wx.EVT_BUTTON, self.OnRemove)
         self.export_btn.Bind(wx.EVT_BUTTON, self.OnExport)
+        self.Bind(wx.EVT_CLOSE, self.OnClose)
+        self.Bind(wx.EVT_MENU, self.OnToggleTrace, self.trace_item)
+        self.Bind(wx.EVT_MENU, self.OnAnalyzeExport, analyze_item)
+        self.Bind(wx.EVT_MENU, self.OnCompareExports, compare_item)
+
+        self.registry_buttons = [self.create_btn, self.import_btn, self.scan_btn,
+                                 self.rename_btn, self.remove_btn]
+        for btn in self.registry_buttons:
+            btn.Disable()
 
         self.RefreshList()
 
@@ -141,9 +193,11 @@ class ProjectManagerFrame(wx.Frame):
             if icon_path:
                 shutil.copy(icon_path, os.path.join(proj_path, "icon.png"))
             else:
+                from PIL import Image
                 # Write a placeholder icon.png (1x1 transparent PNG)
                 Image.new('RGBA', (64, 64), (0,0,0,0)).save(os.path.join(proj_path, "icon.png"))
             # Write .heartproj file
+            import yaml
             class QuotedDumper(yaml.SafeDumper):
                 pass
             def quoted_presenter(dumper, data):
@@ -185,16 +239,7 @@ class ProjectManagerFrame(wx.Frame):
     def OnScan(self, event):
         root = wx.DirSelector("Select Folder to Scan for Projects")
         if root:
-            for dirpath, dirnames, filenames in os.walk(root):
-                if "main.lua" in filenames:
-                    name = os.path.basename(dirpath)
-                    if not any(p["path"] == dirpath for p in self.projects):
-                        project = {
-                            "name": name,
-                            "path": dirpath,
-                            "last_edited": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-                        self.projects.append(project)
+            self.projects.extend(scan_projects(root, self.projects))
             save_projects(self.projects)
             self.RefreshList()
 
@@ -213,6 +258,7 @@ class ProjectManagerFrame(wx.Frame):
                 proj_name = os.path.basename(project['path'])
                 heartproj_path = os.path.join(project['path'], f"{proj_name}.heartproj")
                 # Update .heartproj file
+                import yaml
                 class QuotedDumper(yaml.SafeDumper):
                     pass
                 def quoted_presenter(dumper, data):
@@ -237,6 +283,143 @@ class ProjectManagerFrame(wx.Frame):
             path = self.projects[self.selected_index]["path"]
             run_love_project(path)
 
+    def OnDevRun(self, event):
+        if self.selected_index is None:
+            return
+        path = self.projects[self.selected_index]["path"]
+        if path in self.dev_sessions:
+            wx.MessageBox("A dev-mode run of this project is already active.", "Dev Run")
+            return
+        name = self.projects[self.selected_index]["name"]
+        from hot_reload import DevSession
+
+        def on_reload(changed, ok, latency_ms, message):
+            if ok:
+                text = f"{name}: reloaded {changed} in {latency_ms:.0f} ms"
+            else:
+                text = f"{name}: reload of {changed} failed: {message}"
+            wx.CallAfter(self.SetStatusText, text)
+
+        def on_exit():
+            self.dev_sessions.pop(path, None)
+            wx.CallAfter(self.SetStatusText, f"{name}: dev run ended")
+
+        try:
+            self.dev_sessions[path] = DevSession(path, on_reload=on_reload, on_exit=on_exit).start()
+        except OSError as e:
+            wx.MessageBox(f"Dev run failed: {str(e)}", "Dev Run Error", wx.OK | wx.ICON_ERROR)
+            return
+        self.SetStatusText(f"{name}: dev run started, watching for changes")
+
+    def OnMultiRun(self, event):
+        if self.selected_index is None:
+            return
+        project = self.projects[self.selected_index]
+        dlg = MultiRunDialog(self, project)
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy()
+            return
+        options = dlg.GetData()
+        dlg.Destroy()
+        from multi_launch import LaunchGroup, format_summary
+        group = None
+
+        def on_exit():
+            # Runs on the sampler thread, so the UI is only touched through wx.CallAfter
+            if group in self.launch_groups:
+                self.launch_groups.remove(group)
+            error = None
+            if options['timeline']:
+                try:
+                    group.save(options['timeline'])
+                except OSError as e:
+                    error = e
+            if self.closing:
+                return
+            if error is not None:
+                wx.CallAfter(wx.MessageBox, f"Could not save the timeline to {options['timeline']}: {str(error)}\n\n"
+                             f"{format_summary(group.timeline())}", "Run N Error", wx.OK | wx.ICON_ERROR)
+            elif options['timeline']:
+                wx.CallAfter(wx.MessageBox, format_summary(group.timeline()), "Run N Summary")
+            else:
+                wx.CallAfter(self.SetStatusText, f"{project['name']}: all instances exited")
+
+        group = LaunchGroup(project['path'], options['count'], options['args'], options['env'],
+                            options['base_port'], options['stagger'], options['pin'],
+                            options['nice'], on_exit=on_exit)
+        self.launch_groups.append(group)
+        try:
+            group.start()
+        except (OSError, ValueError) as e:
+            self.launch_groups.remove(group)
+            wx.MessageBox(f"Launch failed: {str(e)}", "Run N Error", wx.OK | wx.ICON_ERROR)
+            return
+        self.SetStatusText(f"{project['name']}: launching {options['count']} instances")
+
+    def OnToggleTrace(self, event):
+        if self.trace_item.IsChecked():
+            tracing.reset()
+            tracing.enable()
+            self.SetStatusText("Recording trace")
+            return
+        tracing.disable()
+        dlg = wx.FileDialog(self, "Save Trace", defaultFile="heartcore-trace.json",
+                            wildcard="Chrome trace (*.json)|*.json",
+                            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT)
+        if dlg.ShowModal() == wx.ID_OK:
+            tracing.write_trace(dlg.GetPath())
+            wx.MessageBox(tracing.format_summary(), "Trace Summary")
+        dlg.Destroy()
+        self.SetStatusText("")
+
+    def SelectExportArchive(self, message):
+        dlg = wx.FileDialog(self, message,
+                            wildcard="Love2D exports (*.love;*.exe)|*.love;*.exe|All files (*.*)|*.*",
+                            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST)
+        path = dlg.GetPath() if dlg.ShowModal() == wx.ID_OK else None
+        dlg.Destroy()
+        return path
+
+    def OnAnalyzeExport(self, event):
+        path = self.SelectExportArchive("Select Export to Analyze")
+        if not path:
+            return
+        from love_analyzer import analyze, format_report
+        try:
+            text = format_report(analyze(path))
+        except Exception as e:
+            wx.MessageBox(f"Analysis failed: {str(e)}", "Analyze Error", wx.OK | wx.ICON_ERROR)
+            return
+        dlg = ReportDialog(self, "Export Analysis", text)
+        dlg.ShowModal()
+        dlg.Destroy()
+
+    def OnCompareExports(self, event):
+        old_path = self.SelectExportArchive("Select Previous Export")
+        if not old_path:
+            return
+        new_path = self.SelectExportArchive("Select New Export")
+        if not new_path:
+            return
+        from love_analyzer import analyze, diff, format_diff
+        try:
+            text = format_diff(diff(analyze(old_path), analyze(new_path)))
+        except Exception as e:
+            wx.MessageBox(f"Comparison failed: {str(e)}", "Analyze Error", wx.OK | wx.ICON_ERROR)
+            return
+        dlg = ReportDialog(self, "Export Comparison", text)
+        dlg.ShowModal()
+        dlg.Destroy()
+
+    def OnClose(self, event):
+        for session in list(self.dev_sessions.values()):
+            session.stop()
+        self.dev_sessions.clear()
+        self.closing = True
+        for group in list(self.launch_groups):
+            group.stop()
+        event.Skip()
+
     def OnRename(self, event):
         if self.selected_index is not None:
             dlg = wx.TextEntryDialog(self, "New Project Name:", "Rename Project")
@@ -269,218 +452,16 @@ class ProjectManagerFrame(wx.Frame):
         dlg.Destroy()
 
     def ExportProject(self, project, export_data):
+        def notify(level, title, message):
+            icon = wx.ICON_WARNING if level == "warning" else wx.ICON_INFORMATION
+            wx.MessageBox(message, title, wx.OK | icon)
+
         try:
-            # Read project metadata to get Love2D version
-            proj_name = os.path.basename(project['path'])
-            heartproj_path = os.path.join(project['path'], f"{proj_name}.heartproj")
-            if not os.path.exists(heartproj_path):
-                raise Exception("Project metadata file (.heartproj) not found")
-            
-            with open(heartproj_path, 'r', encoding='utf-8') as f:
-                project_data = yaml.safe_load(f)
-                love_version = project_data.get('love_version')
-                if not love_version:
-                    raise Exception("Love2D version not specified in project metadata")
-            
-            # Create temp directory for build process
-            temp_dir = os.path.join(export_data['output_dir'], 'temp_build')
-            os.makedirs(temp_dir, exist_ok=True)
-            
-            try:
-                # Create .love file
-                love_path = os.path.join(temp_dir, f"{project['name']}.love")
-                with zipfile.ZipFile(love_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for root, dirs, files in os.walk(project['path']):
-                        for file in files:
-                            if file.endswith('.heartproj'):  # Skip project metadata
-                                continue
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, project['path'])
-                            zipf.write(file_path, arcname)
-
-                # Platform-specific export
-                platform = export_data['platform']
-                runtime_dir = os.path.join(RUNTIMES_PATH, love_version, platform.lower())
-                if not os.path.exists(runtime_dir):
-                    wx.MessageBox(f"Warning: No runtime found for {platform} ({love_version}) in runtimes folder. Export will skip copying the runtime.", "Export Warning", wx.OK | wx.ICON_WARNING)
-                    # Still copy .love and libs, but skip runtime
-                    if platform == 'Windows':
-                        # Only copy .love and libs
-                        shutil.copy2(love_path, os.path.join(export_data['output_dir'], f"{project['name']}.love"))
-                        self.copy_project_libs(project['path'], 'Windows', export_data['output_dir'])
-                    elif platform == 'MacOS':
-                        shutil.copy2(love_path, os.path.join(export_data['output_dir'], f"{project['name']}.love"))
-                        self.copy_project_libs(project['path'], 'MacOS', export_data['output_dir'])
-                    elif platform == 'Linux':
-                        shutil.copy2(love_path, os.path.join(export_data['output_dir'], f"{project['name']}.love"))
-                        self.copy_project_libs(project['path'], 'Linux', export_data['output_dir'])
-                else:
-                    if platform == 'Windows':
-                        self.ExportWindows(project, export_data, love_path, temp_dir, love_version)
-                    elif platform == 'MacOS':
-                        self.ExportMacOS(project, export_data, love_path, temp_dir, love_version)
-                    elif platform == 'Linux':
-                        self.ExportLinux(project, export_data, love_path, temp_dir, love_version)
-                wx.MessageBox(f"Project exported successfully to {export_data['output_dir']}", "Export Complete")
-            finally:
-                # Clean up temp directory
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
+            export_project(project, export_data, notify=notify)
+            wx.MessageBox(f"Project exported successfully to {export_data['output_dir']}", "Export Complete")
         except Exception as e:
             wx.MessageBox(f"Export failed: {str(e)}", "Export Error", wx.OK | wx.ICON_ERROR)
 
-    def ExportWindows(self, project, export_data, love_path, temp_dir, love_version):
-        # Get Love2D runtime from app directory
-        runtime_dir = os.path.join(RUNTIMES_PATH, love_version, 'windows')
-        if not os.path.exists(runtime_dir):
-            raise Exception(f"Love2D runtime files not found for version {love_version} on Windows. Please ensure the runtime files are in the 'runtimes/{love_version}/windows' directory.")
-        
-        # Copy Love2D runtime files to temp directory
-        for file in os.listdir(runtime_dir):
-            src = os.path.join(runtime_dir, file)
-            dst = os.path.join(temp_dir, file)
-            if os.path.isfile(src):
-                shutil.copy2(src, dst)
-
-        # Create fused executable
-        love_exe = os.path.join(temp_dir, "love.exe")
-        output_exe = os.path.join(export_data['output_dir'], f"{project['name']}.exe")
-        
-        # Use PowerShell to combine files
-        cmd = f'Get-Content "{love_exe}","{love_path}" -Encoding Byte | Set-Content "{output_exe}" -Encoding Byte'
-        subprocess.run(['powershell', '-Command', cmd], check=True)
-
-        # Copy required DLLs to output directory
-        for dll in ['SDL2.dll', 'OpenAL32.dll', 'love.dll', 'lua51.dll', 'mpg123.dll', 'msvcp120.dll', 'msvcr120.dll']:
-            src = os.path.join(temp_dir, dll)
-            if os.path.exists(src):
-                shutil.copy2(src, os.path.join(export_data['output_dir'], dll))
-
-        # Copy project libraries
-        self.copy_project_libs(project['path'], 'Windows', export_data['output_dir'])
-
-    def ExportMacOS(self, project, export_data, love_path, temp_dir, love_version):
-        # Get Love2D runtime from app directory
-        runtime_dir = os.path.join(RUNTIMES_PATH, love_version, 'macos')
-        if not os.path.exists(runtime_dir):
-            raise Exception(f"Love2D runtime files not found for version {love_version} on MacOS. Please ensure the runtime files are in the 'runtimes/{love_version}/macos' directory.")
-        
-        # Create .app structure
-        app_name = f"{project['name']}.app"
-        app_path = os.path.join(export_data['output_dir'], app_name)
-        contents_path = os.path.join(app_path, "Contents")
-        resources_path = os.path.join(contents_path, "Resources")
-        macos_path = os.path.join(contents_path, "MacOS")
-        
-        os.makedirs(resources_path, exist_ok=True)
-        os.makedirs(macos_path, exist_ok=True)
-
-        # Copy .love file
-        shutil.copy2(love_path, os.path.join(resources_path, "game.love"))
-
-        # Create Info.plist
-        plist_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
-<plist version="1.0">
-<dict>
-    <key>CFBundleIdentifier</key>
-    <string>{export_data['bundle_id']}</string>
-    <key>CFBundleName</key>
-    <string>{project['name']}</string>
-    <key>CFBundleDisplayName</key>
-    <string>{project['name']}</string>
-    <key>CFBundleVersion</key>
-    <string>{export_data['version']}</string>
-    <key>CFBundleShortVersionString</key>
-    <string>{export_data['version']}</string>
-    <key>CFBundlePackageType</key>
-    <string>APPL</string>
-    <key>CFBundleSignature</key>
-    <string>LOVE</string>
-    <key>CFBundleExecutable</key>
-    <string>love</string>
-    <key>NSHighResolutionCapable</key>
-    <true/>
-</dict>
-</plist>'''
-        
-        with open(os.path.join(contents_path, "Info.plist"), 'w') as f:
-            f.write(plist_content)
-
-        # Copy Love2D binary and libraries
-        for file in os.listdir(runtime_dir):
-            src = os.path.join(runtime_dir, file)
-            if file == 'love':
-                dst = os.path.join(macos_path, file)
-            else:
-                dst = os.path.join(resources_path, file)
-            if os.path.isfile(src):
-                shutil.copy2(src, dst)
-
-        # Copy project libraries
-        self.copy_project_libs(project['path'], 'MacOS', resources_path)
-
-    def ExportLinux(self, project, export_data, love_path, temp_dir, love_version):
-        # Get Love2D runtime from app directory
-        runtime_dir = os.path.join(RUNTIMES_PATH, love_version, 'linux')
-        if not os.path.exists(runtime_dir):
-            raise Exception(f"Love2D runtime files not found for version {love_version} on Linux. Please ensure the runtime files are in the 'runtimes/{love_version}/linux' directory.")
-        
-        # Create AppDir structure
-        appimage_dir = os.path.join(export_data['output_dir'], "AppDir")
-        os.makedirs(appimage_dir, exist_ok=True)
-
-        # Create .desktop file
-        desktop_content = f'''[Desktop Entry]
-Name={project['name']}
-Exec=love %f
-Type=Application
-Categories=Game;
-Comment={export_data.get('description', '')}
-'''
-        with open(os.path.join(appimage_dir, f"{project['name']}.desktop"), 'w') as f:
-            f.write(desktop_content)
-
-        # Copy .love file
-        shutil.copy2(love_path, os.path.join(appimage_dir, "game.love"))
-
-        # Copy Love2D runtime files
-        for file in os.listdir(runtime_dir):
-            src = os.path.join(runtime_dir, file)
-            dst = os.path.join(appimage_dir, file)
-            if os.path.isfile(src):
-                shutil.copy2(src, dst)
-
-        # Copy project libraries
-        self.copy_project_libs(project['path'], 'Linux', appimage_dir)
-
-        # Note: Full AppImage creation would require additional tools and configuration
-        wx.MessageBox("Linux export created basic AppDir structure. Full AppImage creation requires additional setup.", 
-                     "Linux Export", wx.OK | wx.ICON_INFORMATION)
-
-    def copy_project_libs(self, project_path, target_os, dest_path):
-        """Copy required libraries for the target OS to the destination folder"""
-        # Read project metadata
-        proj_name = os.path.basename(project_path)
-        heartproj_path = os.path.join(project_path, f"{proj_name}.heartproj")
-        if not os.path.exists(heartproj_path):
-            return
-        
-        with open(heartproj_path, 'r', encoding='utf-8') as f:
-            project_data = yaml.safe_load(f)
-            libs = project_data.get('libs', [])
-        
-        if not libs:
-            return
-        
-        # Copy each library's files
-        for lib in libs:
-            lib_files = get_lib_files(lib, target_os)
-            for file in lib_files:
-                src = os.path.join(LIBS_PATH, lib, target_os.lower(), file)
-                if os.path.exists(src):
-                    shutil.copy2(src, os.path.join(dest_path, file))
-
 class ProjectDialog(wx.Dialog):
     def __init__(self, parent, project_path=None, edit_mode=False):
         super().__init__(parent, title="Create New Project" if not edit_mode else "Edit Project", size=(420, 500))
@@ -590,6 +571,7 @@ class ProjectDialog(wx.Dialog):
 
     def LoadProjectData(self):
         if self.project_path:
+            import yaml
             with open(os.path.join(self.project_path, f"{os.path.basename(self.project_path)}.heartproj"), 'r', encoding='utf-8') as f:
                 project_data = yaml.safe_load(f)
                 self.name_ctrl.SetValue(project_data['name'])
@@ -621,6 +603,8 @@ class ExportDialog(wx.Dialog):
     def __init__(self, parent, project):
         super().__init__(parent, title=f"Export {project['name']}", size=(400, 500))
         self.project = project
+        # Read the project's .heartproj once for the lifetime of the dialog
+        self.project_data = read_project_meta(project['path']) or {}
         self.InitUI()
         self.Center()
 
@@ -699,21 +683,17 @@ class ExportDialog(wx.Dialog):
     def OnPlatformChange(self, event):
         platform = self.platform_choice.GetString(self.platform_choice.GetSelection()).lower()
         # Get Love2D version from project .heartproj
-        love_version = None
-        if hasattr(self, 'project') and self.project:
-            proj_name = os.path.basename(self.project['path'])
-            heartproj_path = os.path.join(self.project['path'], f"{proj_name}.heartproj")
-            if os.path.exists(heartproj_path):
-                with open(heartproj_path, 'r', encoding='utf-8') as f:
-                    project_data = yaml.safe_load(f)
-                    love_version = project_data.get('love_version')
+        love_version = self.project_data.get('love_version')
         if not love_version:
             love_version = '11.5'  # fallback default
-        runtime_dir = os.path.join(RUNTIMES_PATH, love_version, platform)
-        if not os.path.exists(runtime_dir):
-            self.runtime_warning.SetLabel(f"Warning: No runtime found for {platform} ({love_version}) in runtimes folder. Export will skip copying the runtime.")
-        else:
-            self.runtime_warning.SetLabel("")
+        catalog = get_catalog()
+        warnings = []
+        if not catalog.has_runtime(love_version, platform):
+            warnings.append(f"Warning: No runtime found for {platform} ({love_version}) in runtimes folder. Export will skip copying the runtime.")
+        missing_libs = catalog.missing_libs(self.project_data.get('libs', []), platform)
+        if missing_libs:
+            warnings.append(f"Warning: No {platform} files for libraries: {', '.join(missing_libs)}.")
+        self.runtime_warning.SetLabel("\n".join(warnings))
         # Update default output directory
         default_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
                                  'exports', 
@@ -730,9 +710,113 @@ class ExportDialog(wx.Dialog):
             'description': self.desc_ctrl.GetValue()
         }
 
+class MultiRunDialog(wx.Dialog):
+    def __init__(self, parent, project):
+        super().__init__(parent, title=f"Run {project['name']}", size=(420, 480))
+        self.project = project
+        self.InitUI()
+        self.Center()
+
+    def InitUI(self):
+        panel = wx.Panel(self)
+        vbox = wx.BoxSizer(wx.VERTICAL)
+        grid = wx.FlexGridSizer(cols=2, vgap=5, hgap=8)
+        grid.AddGrowableCol(1)
+
+        self.count_ctrl = wx.SpinCtrl(panel, min=1, max=64, initial=2)
+        self.stagger_ctrl = wx.SpinCtrlDouble(panel, min=0, max=30, initial=0.5, inc=0.1)
+        self.port_ctrl = wx.SpinCtrl(panel, min=0, max=65535, initial=0)
+        self.nice_ctrl = wx.SpinCtrl(panel, min=0, max=19, initial=0)
+        for label, ctrl in (("Instances:", self.count_ctrl), ("Stagger (s):", self.stagger_ctrl),
+                            ("Base port (0 = none):", self.port_ctrl), ("Nice level:", self.nice_ctrl)):
+            grid.Add(wx.StaticText(panel, label=label), 0, wx.ALIGN_CENTER_VERTICAL)
+            grid.Add(ctrl, 1, wx.EXPAND)
+        vbox.Add(grid, 0, wx.EXPAND|wx.ALL, 8)
+
+        self.pin_check = wx.CheckBox(panel, label="Pin each instance to its own CPU")
+        vbox.Add(self.pin_check, 0, wx.LEFT|wx.RIGHT|wx.BOTTOM, 8)
+
+        # Templates expanded per instance
+        vbox.Add(wx.StaticText(panel, label="Arguments ({i} = instance, {n} = count, {port}):"), 0, wx.LEFT|wx.RIGHT, 8)
+        self.args_ctrl = wx.TextCtrl(panel)
+        vbox.Add(self.args_ctrl, 0, wx.EXPAND|wx.ALL, 8)
+        vbox.Add(wx.StaticText(panel, label="Environment (NAME=value per line):"), 0, wx.LEFT|wx.RIGHT, 8)
+        self.env_ctrl = wx.TextCtrl(panel, value="PLAYER_ID={i}", style=wx.TE_MULTILINE)
+        vbox.Add(self.env_ctrl, 1, wx.EXPAND|wx.ALL, 8)
+
+        vbox.Add(wx.StaticText(panel, label="Save resource timeline to (optional):"), 0, wx.LEFT|wx.RIGHT, 8)
+        self.timeline_ctrl = wx.FilePickerCtrl(panel, message="Save Timeline", wildcard="JSON (*.json)|*.json",
+                                               style=wx.FLP_SAVE | wx.FLP_OVERWRITE_PROMPT | wx.FLP_USE_TEXTCTRL)
+        vbox.Add(self.timeline_ctrl, 0, wx.EXPAND|wx.ALL, 8)
+
+        # Buttons
+        button_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        ok_button = wx.Button(panel, wx.ID_OK, "Run")
+        cancel_button = wx.Button(panel, wx.ID_CANCEL, "Cancel")
+        button_sizer.Add(ok_button, 0, wx.ALL, 5)
+        button_sizer.Add(cancel_button, 0, wx.ALL, 5)
+        vbox.Add(button_sizer, 0, wx.ALIGN_CENTER|wx.ALL, 5)
+
+        panel.SetSizer(vbox)
+        ok_button.Bind(wx.EVT_BUTTON, self.OnOK)
+
+    def OnOK(self, event):
+        import shlex
+        from multi_launch import parse_env, check_templates
+        try:
+            args = shlex.split(self.args_ctrl.GetValue())
+            env = parse_env(self.EnvLines())
+            check_templates(args + list(env.values()), self.port_ctrl.GetValue() or None)
+        except ValueError as e:
+            wx.MessageBox(str(e), "Invalid Run Options", wx.OK | wx.ICON_ERROR)
+            return
+        event.Skip()
+
+    def EnvLines(self):
+        return [line.strip() for line in self.env_ctrl.GetValue().splitlines() if line.strip()]
+
+    def GetData(self):
+        import shlex
+        from multi_launch import parse_env
+        return {
+            'count': self.count_ctrl.GetValue(),
+            'stagger': self.stagger_ctrl.GetValue(),
+            'base_port': self.port_ctrl.GetValue() or None,
+            'nice': self.nice_ctrl.GetValue() or None,
+            'pin': self.pin_check.GetValue(),
+            'args': shlex.split(self.args_ctrl.GetValue()),
+            'env': parse_env(self.EnvLines()),
+            'timeline': self.timeline_ctrl.GetPath(),
+        }
+
+class ReportDialog(wx.Dialog):
+    def __init__(self, parent, title, text):
+        super().__init__(parent, title=title, size=(760, 560),
+                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        vbox = wx.BoxSizer(wx.VERTICAL)
+        report_ctrl = wx.TextCtrl(self, value=text, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.HSCROLL)
+        report_ctrl.SetFont(wx.Font(9, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+        vbox.Add(report_ctrl, 1, wx.EXPAND|wx.ALL, 8)
+        vbox.Add(wx.Button(self, wx.ID_OK, "Close"), 0, wx.ALIGN_CENTER|wx.BOTTOM, 8)
+        self.SetSizer(vbox)
+        self.Center()
+
+def install_startup_probe(frame, probe_path):
+    """Record the time of the first paint to probe_path and close (used by startup_bench.py)"""
+    def on_paint(event):
+        event.Skip()
+        frame.panel.Unbind(wx.EVT_PAINT, handler=on_paint)
+        with open(probe_path, "w", encoding="utf-8") as f:
+            f.write(repr(time.time()))
+        wx.CallAfter(frame.Close)
+    frame.panel.Bind(wx.EVT_PAINT, on_paint)
+
 def main():
     app = wx.App(False)
-    ProjectManagerFrame()
+    frame = ProjectManagerFrame()
+    probe_path = os.environ.get("HEARTCORE_STARTUP_PROBE")
+    if probe_path:
+        install_startup_probe(frame, probe_path)
     app.MainLoop()
 
 if __name__ == "__main__":
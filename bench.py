@@ -0,0 +1,220 @@
+"""Headless benchmarks for HeartCore's scan, pack, export and registry operations.
+
+Workloads are generated from a fixed seed so every run measures the same bytes:
+
+- a deep directory tree holding N projects (plus folders that are not projects),
+- an asset-heavy game mixing compressible text and incompressible binary files,
+- a project registry with thousands of entries,
+- fake ``runtimes/`` and ``libs/`` folders so exports run without real Love2D builds.
+
+Results are written as JSON; pass an earlier result file to ``--compare`` to flag
+regressions.
+
+    python bench.py --size medium --output before.json
+    python bench.py --size medium --output after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+from catalog import Catalog
+from exporter import export_project, pack_love, copy_project_libs
+from project_manager import load_projects, save_projects, scan_projects
+
+LOVE_VERSION = "11.5"
+BENCH_LIB = "benchlib"
+
+SIZES = {
+    "small": {"projects": 50, "depth": 4, "lua_files": 50, "compressible": 2 << 20,
+              "incompressible": 2 << 20, "registry": 1000, "runtime": 1 << 20},
+    "medium": {"projects": 300, "depth": 6, "lua_files": 300, "compressible": 16 << 20,
+               "incompressible": 16 << 20, "registry": 10000, "runtime": 8 << 20},
+    "large": {"projects": 2000, "depth": 8, "lua_files": 2000, "compressible": 128 << 20,
+              "incompressible": 128 << 20, "registry": 50000, "runtime": 32 << 20},
+}
+
+WORDS = ["love", "graphics", "draw", "update", "player", "enemy", "tile", "sprite",
+         "local", "function", "return", "end", "self", "table", "insert", "math"]
+
+def lua_source(rng, lines):
+    out = []
+    for i in range(lines):
+        a, b = rng.choice(WORDS), rng.choice(WORDS)
+        out.append(f"local {a}_{i} = {b}.{rng.choice(WORDS)}({rng.randint(0, 999)})")
+    return "\n".join(out) + "\n"
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(path, mode) as f:
+        f.write(data)
+
+def gen_project_tree(root, projects, depth, rng):
+    """Scatter projects at random depths below root, with non-project folders in between"""
+    for i in range(projects):
+        parts = [f"dir{rng.randint(0, 9)}" for _ in range(rng.randint(1, depth))]
+        proj = os.path.join(root, *parts, f"game{i}")
+        write_file(os.path.join(proj, "main.lua"), lua_source(rng, 5))
+        write_file(os.path.join(proj, "conf.lua"), "function love.conf(t) end\n")
+        for j in range(3):
+            write_file(os.path.join(proj, "src", f"mod{j}.lua"), lua_source(rng, 10))
+        write_file(os.path.join(proj, "assets", "notes.txt"), lua_source(rng, 3))
+
+def gen_asset_game(root, name, lua_files, compressible, incompressible, rng, chunk=256 << 10):
+    """Create a project folder with .heartproj, Lua sources and mixed assets; returns its path"""
+    import yaml
+    proj = os.path.join(root, name)
+    meta = {"name": name, "description": "", "version": "1.0.0", "author": "bench",
+            "libs": [BENCH_LIB], "love_version": LOVE_VERSION}
+    write_file(os.path.join(proj, f"{name}.heartproj"), yaml.safe_dump(meta))
+    write_file(os.path.join(proj, "main.lua"), lua_source(rng, 20))
+    for i in range(lua_files):
+        write_file(os.path.join(proj, "src", f"sub{i % 16}", f"mod{i}.lua"), lua_source(rng, 40))
+    # Compressible assets: maps and dialogue as text
+    for i in range(max(1, compressible // chunk)):
+        text = " ".join(rng.choice(WORDS) for _ in range(chunk // 6))
+        write_file(os.path.join(proj, "assets", "maps", f"map{i}.txt"), text[:chunk])
+    # Incompressible assets: stand-ins for PNG/OGG data
+    for i in range(max(1, incompressible // chunk)):
+        write_file(os.path.join(proj, "assets", "audio", f"sound{i}.ogg"), rng.randbytes(chunk))
+    return proj
+
+def gen_registry(n, rng):
+    return [{"name": f"game{i}",
+             "path": os.path.join("/projects", f"dir{rng.randint(0, 99)}", f"game{i}"),
+             "last_edited": "2024-01-01 00:00:00"} for i in range(n)]
+
+def gen_fake_runtimes(root, runtime_bytes, rng):
+    """Create runtimes/<version>/<platform> and libs/<lib>/<os> with filler files"""
+    runtimes = os.path.join(root, "runtimes", LOVE_VERSION)
+    blob = rng.randbytes(runtime_bytes)
+    write_file(os.path.join(runtimes, "windows", "love.exe"), blob)
+    for dll in ["SDL2.dll", "OpenAL32.dll", "love.dll", "lua51.dll"]:
+        write_file(os.path.join(runtimes, "windows", dll), blob[: runtime_bytes // 4])
+    write_file(os.path.join(runtimes, "macos", "love"), blob)
+    write_file(os.path.join(runtimes, "linux", f"love-{LOVE_VERSION}-x86_64.AppImage"), blob)
+    libs = os.path.join(root, "libs", BENCH_LIB)
+    for os_name, ext in (("windows", "dll"), ("macos", "dylib"), ("linux", "so")):
+        for i in range(4):
+            write_file(os.path.join(libs, os_name, f"bench{i}.{ext}"), blob[: runtime_bytes // 8])
+    return Catalog(os.path.join(root, "runtimes"), os.path.join(root, "libs"))
+
+def measure(func, repeat, setup=None):
+    """Time func repeat times, calling setup (untimed) before each run"""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {"runs": samples, "min": min(samples), "median": statistics.median(samples)}
+
+def reset_dir(path):
+    def setup():
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+    return setup
+
+def run_benchmarks(work, params, repeat, only=None):
+    rng = random.Random(params["seed"])
+    tree = os.path.join(work, "tree")
+    gen_project_tree(tree, params["projects"], params["depth"], rng)
+    game = gen_asset_game(work, "bench_game", params["lua_files"], params["compressible"],
+                          params["incompressible"], rng)
+    catalog = gen_fake_runtimes(work, params["runtime"], rng)
+    registry = gen_registry(params["registry"], rng)
+    registry_file = os.path.join(work, "projects.json")
+    out = os.path.join(work, "out")
+    project = {"name": "bench_game", "path": game}
+
+    benches = {
+        "scan": (lambda: scan_projects(tree, []), None),
+        "pack": (lambda: pack_love(game, os.path.join(out, "game.love")), reset_dir(out)),
+        "copy_libs": (lambda: copy_project_libs(game, "Windows", out, catalog), reset_dir(out)),
+        "save_projects": (lambda: save_projects(registry, registry_file), None),
+        "load_projects": (lambda: load_projects(registry_file), lambda: save_projects(registry, registry_file)),
+    }
+    for target in ("Windows", "MacOS", "Linux"):
+        export_data = {"platform": target, "output_dir": out, "bundle_id": "com.bench",
+                       "version": "1.0.0", "description": ""}
+        benches[f"export:{target}"] = (lambda d=export_data: export_project(project, d, catalog), reset_dir(out))
+
+    results = {}
+    for name, (func, setup) in benches.items():
+        if only and name not in only:
+            continue
+        results[name] = measure(func, repeat, setup)
+        print(f"{name:<16} min {results[name]['min'] * 1000:10.1f} ms  median {results[name]['median'] * 1000:10.1f} ms")
+    return results
+
+def compare(results, baseline, threshold):
+    """Print median ratios against baseline; returns the names that regressed"""
+    regressions = []
+    print(f"\nCompared with baseline (threshold {threshold:.0%}):")
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            print(f"  {name:<16} new")
+            continue
+        ratio = current["median"] / previous["median"] if previous["median"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"  {name:<16} {ratio:6.2f}x{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HeartCore scan, pack, export and registry operations.")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="comma-separated benchmark names to run")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown counted as a regression")
+    parser.add_argument("--workdir", help="generate workloads here instead of a temp dir (kept afterwards)")
+    args = parser.parse_args(argv)
+
+    params = dict(SIZES[args.size], seed=args.seed)
+    work = args.workdir or tempfile.mkdtemp(prefix="heartcore-bench-")
+    os.makedirs(work, exist_ok=True)
+    try:
+        only = set(args.only.split(",")) if args.only else None
+        results = run_benchmarks(work, params, args.repeat, only)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "size": args.size,
+        "params": params,
+        "repeat": args.repeat,
+        "python": sys.version,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,27 @@
 import os
+import re
 import sys
+import glob
+import json
+import time
 import shutil
+import hashlib
+import argparse
+import threading
 import subprocess
-import requests
-import zipfile
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from runtime_fetcher import FetchError, MissingPinError, LOCK_FILE, fetch_all, stage_runtime
+from tracing import span
 
 APP_NAME = "HeartCore"
 ENTRY_POINT = "app.py"
 ICON_PATH = "icon.ico"
 REQUIREMENTS = "requirements.txt"
+LIBS_SOURCE = "libs"
+STATE_FILE = os.path.join("build", "stages.json")
 
 RUNTIMES_VERSION = "11.5"
+# SHA-256 pins live in runtimes.lock.json; record missing ones with --pin-new
 PLATFORMS = {
     "windows": {
         "url": "https://github.com/love2d/love/releases/download/11.5/love-11.5-win64.zip",
@@ -34,84 +44,266 @@ os_options = {
     '3': 'MacOS',
 }
 
-print("Select target OS:")
-for k, v in os_options.items():
-    print(f"  {k}. {v}")
-os_choice = input("Enter number: ").strip()
-
-if os_choice not in os_options:
-    print("Invalid choice. Exiting.")
-    sys.exit(1)
-
-TARGET_OS = os_options[os_choice]
-DIST_PATH = os.path.join("dist", TARGET_OS)
-
-# Clean previous build
-if os.path.exists(DIST_PATH):
-    shutil.rmtree(DIST_PATH)
-
-# Install dependencies
-print("Installing dependencies from requirements.txt ...")
-subprocess.run([sys.executable, "-m", "pip", "install", "-r", REQUIREMENTS], check=True)
-
-# Build command
-cmd = [
-    sys.executable, "-m", "PyInstaller",
-    "--name", APP_NAME,
-    "--onefile",
-    "--noconsole",
-    "--distpath", DIST_PATH,
-    ENTRY_POINT
-]
-if os.path.exists(ICON_PATH):
-    cmd.extend(["--icon", ICON_PATH])
-print("Running:", " ".join(cmd))
-subprocess.run(cmd, check=True)
-
-# Create runtimes and libs inside DIST_PATH
-RUNTIMES_PATH = os.path.join(DIST_PATH, "runtimes", RUNTIMES_VERSION)
-if os.path.exists(os.path.join(DIST_PATH, "runtimes")):
-    shutil.rmtree(os.path.join(DIST_PATH, "runtimes"))
-os.makedirs(RUNTIMES_PATH, exist_ok=True)
-
-for platform, info in PLATFORMS.items():
-    plat_dir = os.path.join(RUNTIMES_PATH, platform)
-    os.makedirs(plat_dir, exist_ok=True)
-    print(f"Downloading Love2D 11.5 for {platform}...")
-    r = requests.get(info["url"])
-    if info["extract"]:
-        with zipfile.ZipFile(BytesIO(r.content)) as z:
-            if platform == "windows":
-                # Extract love.exe and all .dll files
-                for member in z.namelist():
-                    if member.endswith("love.exe") or member.endswith(".dll"):
-                        z.extract(member, plat_dir)
-                        # Move to plat_dir root if in subfolder
-                        src = os.path.join(plat_dir, member)
-                        dst = os.path.join(plat_dir, os.path.basename(member))
-                        shutil.move(src, dst)
-                        # Remove now-empty subfolder
-                        subfolder = os.path.join(plat_dir, os.path.dirname(member))
-                        if os.path.isdir(subfolder) and not os.listdir(subfolder):
-                            os.rmdir(subfolder)
-            elif platform == "macos":
-                # Extract the love.app folder
-                for member in z.namelist():
-                    if member.startswith("love.app/"):
-                        z.extract(member, plat_dir)
-    else:
-        # Save AppImage directly
-        appimage_path = os.path.join(plat_dir, "love-11.5-x86_64.AppImage")
-        with open(appimage_path, "wb") as f:
-            f.write(r.content)
-        print(f"Saved AppImage to {appimage_path}")
-
-# Optionally create an empty libs folder inside DIST_PATH
-libs_path = os.path.join(DIST_PATH, "libs")
-if os.path.exists(libs_path):
-    shutil.rmtree(libs_path)
-os.makedirs(libs_path, exist_ok=True)
-
-print(f"\nLove2D runtimes for 11.5 have been set up in '{os.path.join(DIST_PATH, 'runtimes')}'.")
-print(f"An empty 'libs' folder has also been created in '{DIST_PATH}'.")
-print(f"\nBuild complete! Check the '{DIST_PATH}' folder for the executable and required folders.") 
\ No newline at end of file
+def host_target():
+    """The target OS PyInstaller builds for on this machine (it cannot cross-compile)"""
+    if sys.platform == "win32":
+        return "Windows"
+    if sys.platform == "darwin":
+        return "MacOS"
+    return "Linux"
+
+def installed_versions():
+    """Installed version of each package in requirements.txt (None when missing)"""
+    from importlib import metadata
+    versions = {}
+    if not os.path.exists(REQUIREMENTS):
+        return versions
+    with open(REQUIREMENTS, "r", encoding="utf-8") as f:
+        for line in f:
+            match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", line.split("#", 1)[0])
+            if not match:
+                continue
+            try:
+                versions[match.group(1)] = metadata.version(match.group(1))
+            except metadata.PackageNotFoundError:
+                versions[match.group(1)] = None
+    return versions
+
+def hash_files(h, paths):
+    """Feed the names and contents of paths into hash h"""
+    for path in sorted(paths):
+        h.update(path.replace(os.sep, "/").encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+
+def fingerprint(*parts, files=()):
+    h = hashlib.sha256()
+    h.update(json.dumps(parts, sort_keys=True).encode("utf-8"))
+    hash_files(h, files)
+    return h.hexdigest()
+
+def tree_files(root):
+    if not os.path.isdir(root):
+        return []
+    return [os.path.join(dirpath, name)
+            for dirpath, _, filenames in os.walk(root)
+            for name in filenames]
+
+class StageRunner:
+    """Run build stages, skipping those whose input fingerprint is unchanged"""
+
+    def __init__(self, state_file=STATE_FILE, force=False):
+        self.state_file = state_file
+        self.force = force
+        self.state = {}
+        if not force and os.path.exists(state_file):
+            with open(state_file, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        self.timings = []
+        self.lock = threading.Lock()
+
+    def run(self, name, fp, func, output=None):
+        """Run func unless stage name already ran with fingerprint fp and output still exists"""
+        started = time.perf_counter()
+        fresh = self.state.get(name) == fp and (output is None or os.path.exists(output))
+        if fresh:
+            status = "skipped"
+        else:
+            with span(f"stage {name}"):
+                func()
+            status = "done"
+            with self.lock:
+                self.state[name] = fp
+                os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+                with open(self.state_file, "w", encoding="utf-8") as f:
+                    json.dump(self.state, f, indent=2, sort_keys=True)
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.timings.append((name, status, elapsed))
+        print(f"[{name}] {status} in {elapsed:.2f}s")
+
+    def print_summary(self):
+        print("\nStage timings:")
+        for name, status, elapsed in self.timings:
+            print(f"  {name:<28} {status:<8} {elapsed:8.2f}s")
+
+def install_deps():
+    print("Installing dependencies from requirements.txt ...")
+    subprocess.run([sys.executable, "-m", "pip", "install", "-r", REQUIREMENTS], check=True)
+
+def dist_layout(target_os, layout):
+    """Return (dist path, folder holding the executable, runtimes and libs) for a layout.
+
+    onefile unpacks the whole bundle to a temp dir on every launch; onedir keeps it
+    unpacked next to the executable, which starts much faster.
+    """
+    if layout == "onedir":
+        dist_path = os.path.join("dist", f"{target_os}-onedir")
+        return dist_path, os.path.join(dist_path, APP_NAME)
+    dist_path = os.path.join("dist", target_os)
+    return dist_path, dist_path
+
+def pyinstaller_command(dist_path, target_os, layout="onefile"):
+    work_path = os.path.join("build", "pyinstaller", f"{target_os}-{layout}")
+    cmd = [
+        sys.executable, "-m", "PyInstaller",
+        "--name", APP_NAME,
+        f"--{layout}",
+        "--noconsole",
+        "--noconfirm",
+        "--distpath", dist_path,
+        "--workpath", work_path,
+        "--specpath", work_path,
+    ]
+    if os.path.exists(ICON_PATH):
+        cmd.extend(["--icon", os.path.abspath(ICON_PATH)])
+    cmd.append(os.path.abspath(ENTRY_POINT))
+    return cmd
+
+def build_target(runner, pool, target_os, archives, layout="onefile"):
+    """Schedule the PyInstaller, runtime and libs stages of one target; returns their futures"""
+    dist_path, app_dir = dist_layout(target_os, layout)
+    os.makedirs(app_dir, exist_ok=True)
+    stage_suffix = target_os if layout == "onefile" else f"{target_os}-{layout}"
+
+    cmd = pyinstaller_command(dist_path, target_os, layout)
+    sources = [p for p in glob.glob("*.py") if p != "build.py"]
+    if os.path.exists(ICON_PATH):
+        sources.append(ICON_PATH)
+    exe_name = APP_NAME + (".exe" if sys.platform == "win32" else "")
+
+    def run_pyinstaller():
+        print("Running:", " ".join(cmd))
+        subprocess.run(cmd, check=True)
+
+    # The bundle depends on the interpreter and installed packages as much as on the sources
+    pyinstaller_fp = fingerprint(cmd, sys.version, installed_versions(), files=sources)
+
+    def pyinstaller_stage():
+        runner.run(f"pyinstaller:{stage_suffix}", pyinstaller_fp, run_pyinstaller, os.path.join(app_dir, exe_name))
+
+    # Create runtimes next to the executable
+    runtimes_root = os.path.join(app_dir, "runtimes")
+    runtimes_path = os.path.join(runtimes_root, RUNTIMES_VERSION)
+
+    def stage_runtimes():
+        if os.path.exists(runtimes_root):
+            shutil.rmtree(runtimes_root)
+        for platform, info in PLATFORMS.items():
+            stage_runtime(platform, info, archives[platform], os.path.join(runtimes_path, platform))
+
+    def runtimes_stage():
+        # Cached archives are content-addressed, so their names are their digests
+        digests = {p: os.path.basename(a) for p, a in archives.items()}
+        runner.run(f"runtimes:{stage_suffix}", fingerprint(RUNTIMES_VERSION, PLATFORMS, digests),
+                   stage_runtimes, runtimes_path)
+
+    # libs folder next to the executable, seeded from ./libs when it exists
+    libs_path = os.path.join(app_dir, "libs")
+    lib_files = tree_files(LIBS_SOURCE)
+
+    def copy_libs():
+        if os.path.exists(libs_path):
+            shutil.rmtree(libs_path)
+        if os.path.isdir(LIBS_SOURCE):
+            shutil.copytree(LIBS_SOURCE, libs_path)
+        else:
+            os.makedirs(libs_path, exist_ok=True)
+
+    def libs_stage():
+        runner.run(f"libs:{stage_suffix}", fingerprint("libs", files=lib_files), copy_libs, libs_path)
+
+    if layout == "onedir":
+        # PyInstaller recreates the onedir folder, so stage into it only afterwards
+        def onedir_stages():
+            pyinstaller_stage()
+            runtimes_stage()
+            libs_stage()
+        return [pool.submit(onedir_stages)]
+    return [pool.submit(pyinstaller_stage), pool.submit(runtimes_stage), pool.submit(libs_stage)]
+
+def fetch_runtimes(offline=False, mirror=None, pin_new=False):
+    """Download and verify every runtime before any build stage runs; exits with a message on failure"""
+    try:
+        return fetch_all(PLATFORMS, offline=offline, mirror=mirror, pin_new=pin_new)
+    except MissingPinError as e:
+        sys.exit(f"error: {e}\n"
+                 f"Run `python build.py --pin-new` without --mirror to download the runtimes from upstream "
+                 f"and record their SHA-256 in {LOCK_FILE}, then review and commit that file.")
+    except (FetchError, OSError) as e:
+        sys.exit(f"error: could not fetch the Love2D runtimes: {e}")
+
+def parse_targets(value):
+    names = {v.lower(): v for v in os_options.values()}
+    if value.strip().lower() == "all":
+        return list(os_options.values())
+    targets = []
+    for part in value.split(","):
+        key = part.strip().lower()
+        if key not in names:
+            raise argparse.ArgumentTypeError(f"unknown target '{part}', expected one of: {', '.join(os_options.values())}, all")
+        targets.append(names[key])
+    return targets
+
+def prompt_target():
+    print("Select target OS:")
+    for k, v in os_options.items():
+        print(f"  {k}. {v}")
+    os_choice = input("Enter number: ").strip()
+
+    if os_choice not in os_options:
+        print("Invalid choice. Exiting.")
+        sys.exit(1)
+    return [os_options[os_choice]]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"Build {APP_NAME} with bundled Love2D runtimes.")
+    parser.add_argument("--targets", type=parse_targets,
+                        help="comma-separated target OS list (Windows,Linux,MacOS) or 'all'; only the host OS "
+                             "is built, others are skipped; prompts when omitted")
+    parser.add_argument("--skip-deps", action="store_true", help="do not install requirements.txt")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="number of stages to run concurrently")
+    parser.add_argument("--layout", choices=["onefile", "onedir"], default="onefile",
+                        help="onedir skips the per-launch unpacking of onefile builds and starts faster")
+    parser.add_argument("--force", action="store_true", help="rerun every stage even if its inputs are unchanged")
+    parser.add_argument("--offline", action="store_true", default=os.environ.get("HEARTCORE_OFFLINE") == "1",
+                        help="use only cached runtime archives")
+    parser.add_argument("--mirror", default=os.environ.get("HEARTCORE_RUNTIME_MIRROR"),
+                        help="base URL serving the runtime archives instead of GitHub")
+    parser.add_argument("--pin-new", action="store_true",
+                        help="download unpinned runtimes from upstream and record their SHA-256 in runtimes.lock.json")
+    args = parser.parse_args(argv)
+
+    targets = args.targets or prompt_target()
+    host = host_target()
+    for target_os in targets:
+        if target_os != host:
+            print(f"Skipping {target_os}: PyInstaller cannot cross-compile, run this build on {target_os}.")
+    targets = [t for t in targets if t == host]
+    if not targets:
+        print(f"Nothing to build; this machine can only build the {host} target.")
+        sys.exit(1)
+    runner = StageRunner(force=args.force)
+    started = time.perf_counter()
+
+    if not args.skip_deps:
+        runner.run("deps", fingerprint(sys.executable, sys.version, files=[REQUIREMENTS]), install_deps)
+
+    # Runtimes are fetched and checked against their pins before any build stage runs;
+    # only deps goes first because it installs requests
+    archives = fetch_runtimes(args.offline, args.mirror, args.pin_new)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = []
+        for target_os in targets:
+            futures.extend(build_target(runner, pool, target_os, archives, args.layout))
+        for future in futures:
+            future.result()
+
+    runner.print_summary()
+    print(f"\nBuild complete in {time.perf_counter() - started:.2f}s! "
+          f"Check {', '.join(dist_layout(t, args.layout)[1] for t in targets)} for the executable and required folders.")
+
+if __name__ == "__main__":
+    main()
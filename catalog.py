@@ -0,0 +1,154 @@
+"""Cached index of the Love2D runtimes and libraries shipped next to HeartCore.
+
+Layout on disk:
+
+    runtimes/<love version>/<platform>/<files>
+    libs/<library>/<os>/<files>
+
+Both trees are scanned once into memory. Every directory seen during the scan is
+remembered with its mtime, and the index is rebuilt only when one of those
+directories changes, so repeated lookups from the dialogs and the export
+pipeline never list directories again.
+"""
+import hashlib
+import os
+import threading
+
+from project_manager import BASE_DIR
+from tracing import span
+
+RUNTIMES_PATH = os.path.join(BASE_DIR, 'runtimes')
+LIBS_PATH = os.path.join(BASE_DIR, 'libs')
+
+class CatalogFile:
+    """A file in the catalog; the SHA-256 digest is computed on first use"""
+
+    def __init__(self, name, path, size, mtime_ns):
+        self.name = name
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._digest = None
+
+    @property
+    def digest(self):
+        if self._digest is None:
+            h = hashlib.sha256()
+            with open(self.path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    h.update(chunk)
+            self._digest = h.hexdigest()
+        return self._digest
+
+def _scan_tree(root, dir_mtimes):
+    """Index root/<a>/<b>/<files> as {a: {b: {name: CatalogFile}}}"""
+    index = {}
+    dir_mtimes[root] = None
+    try:
+        dir_mtimes[root] = os.stat(root).st_mtime_ns
+        root_entries = os.scandir(root)
+    except OSError:
+        # Missing, or a file where the folder should be: treat it as empty until it changes
+        return index
+    with root_entries:
+        for first in root_entries:
+            if not first.is_dir():
+                continue
+            dir_mtimes[first.path] = first.stat().st_mtime_ns
+            groups = index[first.name] = {}
+            with os.scandir(first.path) as second_entries:
+                for second in second_entries:
+                    if not second.is_dir():
+                        continue
+                    dir_mtimes[second.path] = second.stat().st_mtime_ns
+                    files = groups[second.name] = {}
+                    with os.scandir(second.path) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                st = entry.stat()
+                                files[entry.name] = CatalogFile(entry.name, entry.path, st.st_size, st.st_mtime_ns)
+    return index
+
+class Catalog:
+    """Index of runtimes (version -> platform -> files) and libs (lib -> os -> files)"""
+
+    def __init__(self, runtimes_path=RUNTIMES_PATH, libs_path=LIBS_PATH):
+        self.runtimes_path = runtimes_path
+        self.libs_path = libs_path
+        self._lock = threading.Lock()
+        self._dir_mtimes = None
+        self._runtimes = {}
+        self._libs = {}
+
+    def _is_stale(self):
+        if self._dir_mtimes is None:
+            return True
+        for path, mtime in self._dir_mtimes.items():
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                return True
+        return False
+
+    def refresh(self, force=False):
+        """Rescan both trees if any indexed directory changed since the last scan"""
+        with self._lock:
+            if not force and not self._is_stale():
+                return
+            with span("catalog scan"):
+                dir_mtimes = {}
+                self._runtimes = _scan_tree(self.runtimes_path, dir_mtimes)
+                self._libs = _scan_tree(self.libs_path, dir_mtimes)
+                self._dir_mtimes = dir_mtimes
+
+    def runtime_versions(self):
+        self.refresh()
+        return sorted(self._runtimes)
+
+    def runtime_platforms(self, version):
+        self.refresh()
+        return sorted(self._runtimes.get(version, {}))
+
+    def has_runtime(self, version, platform):
+        self.refresh()
+        return platform.lower() in self._runtimes.get(version, {})
+
+    def runtime_files(self, version, platform):
+        """Files of one runtime as a list of CatalogFile, sorted by name"""
+        self.refresh()
+        files = self._runtimes.get(version, {}).get(platform.lower(), {})
+        return [files[name] for name in sorted(files)]
+
+    def libs(self):
+        self.refresh()
+        return sorted(self._libs)
+
+    def lib_files(self, lib_name, target_os):
+        """Files of one library for an OS as a list of CatalogFile, sorted by name"""
+        self.refresh()
+        files = self._libs.get(lib_name, {}).get(target_os.lower(), {})
+        return [files[name] for name in sorted(files)]
+
+    def lib_availability(self):
+        """Map each library to the set of OS names it ships files for"""
+        self.refresh()
+        return {lib: {os_name for os_name, files in platforms.items() if files}
+                for lib, platforms in self._libs.items()}
+
+    def missing_libs(self, libs, target_os):
+        """Libraries from libs that have no files for target_os"""
+        availability = self.lib_availability()
+        return [lib for lib in libs if target_os.lower() not in availability.get(lib, set())]
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """Return the catalog shared by the GUI and the export pipeline"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog()
+        return _catalog
@@ -0,0 +1,564 @@
+"""Content-hashed export manifests and binary delta patches between exports.
+
+Every export records a new manifest in a folder next to its output folder
+(``<output_dir>.manifests/<version>-<time>.manifest.json``); earlier manifests
+are never replaced, so any shipped release can be diffed against. For each file
+a manifest records the size, SHA-256, a signature of every block (Adler-32 plus
+a short BLAKE2b) and, for zip-based files such as ``.love`` archives and fused
+executables, the byte range and digest of each member's compressed data.
+
+A patch is generated from the previous export's manifest and the new output
+folder, so the old files themselves are not needed:
+
+- files whose SHA-256 did not change are skipped,
+- zip members whose compressed data is unchanged become single copy ops, even
+  when they were renamed or moved,
+- zip members whose content (CRC and size) is new are stored as literal data
+  without searching for matches,
+- the remaining regions are matched against the old block signatures with a
+  rolling Adler-32 (rsync style) when they are at most ROLLING_LIMIT long;
+  longer regions are matched on block boundaries and only roll over a short
+  window to resynchronise after an insertion or deletion,
+- anything left is stored as zlib-compressed literal data.
+
+Applying a patch checks the SHA-256 of every file it modifies before touching
+anything, rebuilds each file next to the original, checks the result against
+the new SHA-256 and only then replaces the originals.
+
+    python delta_patch.py manifest exports/MyGame/windows --label 1.0.0
+    python delta_patch.py diff exports/MyGame/windows.manifests/1.0.0-20260101-120000.manifest.json \
+        exports/MyGame/windows -o 1.0.0-to-1.1.0.hcpatch
+    python delta_patch.py apply v1-to-v2.hcpatch installed/MyGame
+"""
+import os
+import re
+import sys
+import json
+import zlib
+import struct
+import hashlib
+import argparse
+import zipfile
+import datetime
+
+from tracing import span, traced
+
+MAGIC = b"HCPATCH1"
+MANIFEST_VERSION = 1
+BLOCK_SIZE = 64 * 1024
+ROLLING_LIMIT = 1 << 20
+# Blocks searched byte by byte after a run of aligned matches breaks
+RESYNC_BLOCKS = 3
+LITERAL_CHUNK = 1 << 20
+ADLER_MOD = 65521
+ZIP_LOCAL_HEADER = b"PK\x03\x04"
+TEMP_SUFFIX = ".hcpatch-tmp"
+MANIFEST_SUFFIX = ".manifest.json"
+
+class PatchError(Exception):
+    pass
+
+def manifest_dir(output_dir):
+    """Folder next to an export folder holding one manifest per export"""
+    return os.path.normpath(output_dir) + ".manifests"
+
+def list_manifests(output_dir):
+    """Manifests recorded for an export folder, oldest first"""
+    folder = manifest_dir(output_dir)
+    if not os.path.isdir(folder):
+        return []
+    paths = [os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(MANIFEST_SUFFIX)]
+    return sorted(paths, key=lambda path: (os.path.getmtime(path), path))
+
+def _new_manifest_path(output_dir, label=None):
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = re.sub(r"[^A-Za-z0-9._-]+", "_", f"{label}-{stamp}" if label else stamp)
+    path = os.path.join(manifest_dir(output_dir), base + MANIFEST_SUFFIX)
+    n = 1
+    while os.path.exists(path):
+        path = os.path.join(manifest_dir(output_dir), f"{base}-{n}{MANIFEST_SUFFIX}")
+        n += 1
+    return path
+
+def _strong(block):
+    return hashlib.blake2b(block, digest_size=8).hexdigest()
+
+def _zip_members(path):
+    """Return [name, crc, compressed size, size, data offset] per member, or None if not a usable zip"""
+    try:
+        if not zipfile.is_zipfile(path):
+            return None
+        with zipfile.ZipFile(path) as z:
+            infos = [i for i in z.infolist() if not i.is_dir()]
+        members = []
+        with open(path, "rb") as f:
+            for info in infos:
+                f.seek(info.header_offset)
+                header = f.read(30)
+                if len(header) < 30 or header[:4] != ZIP_LOCAL_HEADER:
+                    return None
+                name_len, extra_len = struct.unpack("<HH", header[26:30])
+                data_offset = info.header_offset + 30 + name_len + extra_len
+                members.append([info.filename, info.CRC, info.compress_size, info.file_size, data_offset])
+    except (zipfile.BadZipFile, OSError, ValueError):
+        return None
+    members.sort(key=lambda m: m[4])
+    for prev, cur in zip(members, members[1:]):
+        if prev[4] + prev[2] > cur[4]:
+            return None
+    return members
+
+def _hash_file(path, block_size, ranges=()):
+    """Return (sha256, block signatures, digests of the sorted byte ranges) in one pass"""
+    sha = hashlib.sha256()
+    blocks = []
+    digests = []
+    ri = 0
+    current = None
+    pos = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            sha.update(block)
+            blocks.append([zlib.adler32(block), _strong(block)])
+            end = pos + len(block)
+            while ri < len(ranges) and ranges[ri][0] < end:
+                start, stop = ranges[ri]
+                current = current or hashlib.blake2b(digest_size=16)
+                lo, hi = max(start, pos), min(stop, end)
+                if hi > lo:
+                    current.update(block[lo - pos:hi - pos])
+                if stop > end:
+                    break
+                digests.append(current.hexdigest())
+                current = None
+                ri += 1
+            pos = end
+    while ri < len(ranges):
+        digests.append((current or hashlib.blake2b(digest_size=16)).hexdigest())
+        current = None
+        ri += 1
+    return sha.hexdigest(), blocks, digests
+
+def _manifest_entry(path, st, block_size):
+    members = _zip_members(path)
+    ranges = [(m[4], m[4] + m[2]) for m in members] if members else []
+    sha256, blocks, digests = _hash_file(path, block_size, ranges)
+    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "mode": st.st_mode & 0o777,
+             "sha256": sha256, "blocks": blocks}
+    if members:
+        entry["zip"] = [m + [d] for m, d in zip(members, digests)]
+    return entry
+
+@traced("manifest")
+def build_manifest(root, previous=None, block_size=BLOCK_SIZE):
+    """Hash every file under root, reusing entries of previous whose size and mtime match"""
+    reuse = {}
+    if previous and previous.get("block_size") == block_size:
+        reuse = previous.get("files", {})
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(TEMP_SUFFIX):
+                continue
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, root).replace(os.sep, "/")
+            st = os.stat(full)
+            old = reuse.get(rel)
+            if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                files[rel] = old
+            else:
+                files[rel] = _manifest_entry(full, st, block_size)
+    return {"version": MANIFEST_VERSION, "block_size": block_size, "files": files}
+
+def load_manifest(path):
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise PatchError(f"Unsupported manifest version in {path}")
+    return manifest
+
+def write_manifest(output_dir, path=None, label=None):
+    """Record a new manifest of an export folder, never replacing an earlier one; returns its path"""
+    history = list_manifests(output_dir)
+    previous = None
+    if history:
+        try:
+            previous = load_manifest(history[-1])
+        except (OSError, PatchError, ValueError):
+            previous = None
+    manifest = build_manifest(output_dir, previous)
+    manifest["label"] = label
+    manifest["created"] = datetime.datetime.now().isoformat(timespec="seconds")
+    path = path or _new_manifest_path(output_dir, label)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "x", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    return path
+
+class _OpWriter:
+    """Write copy/literal ops for one file, merging adjacent copies and batching literals"""
+
+    def __init__(self, f):
+        self.f = f
+        self.pending_copy = None
+        self.literal = bytearray()
+        self.copied = 0
+        self.literal_bytes = 0
+
+    def copy(self, offset, length):
+        self._flush_literal()
+        if self.pending_copy and self.pending_copy[0] + self.pending_copy[1] == offset:
+            self.pending_copy[1] += length
+        else:
+            self._flush_copy()
+            self.pending_copy = [offset, length]
+        self.copied += length
+
+    def data(self, data):
+        if not data:
+            return
+        self._flush_copy()
+        self.literal += data
+        self.literal_bytes += len(data)
+        while len(self.literal) >= LITERAL_CHUNK:
+            self._write_literal(bytes(self.literal[:LITERAL_CHUNK]))
+            del self.literal[:LITERAL_CHUNK]
+
+    def end(self):
+        self._flush_copy()
+        self._flush_literal()
+        self.f.write(b"E")
+
+    def _flush_copy(self):
+        if self.pending_copy:
+            self.f.write(b"C" + struct.pack("<QQ", *self.pending_copy))
+            self.pending_copy = None
+
+    def _flush_literal(self):
+        if self.literal:
+            self._write_literal(bytes(self.literal))
+            self.literal = bytearray()
+
+    def _write_literal(self, chunk):
+        packed = zlib.compress(chunk, 6)
+        self.f.write(b"D" + struct.pack("<II", len(chunk), len(packed)) + packed)
+
+def _block_index(entry, block_size):
+    """Map weak checksum -> {strong hash: old offset} for every full block of an old file"""
+    index = {}
+    if not entry:
+        return index
+    full_blocks = entry["size"] // block_size
+    for i, (weak, strong) in enumerate(entry["blocks"][:full_blocks]):
+        index.setdefault(weak, {}).setdefault(strong, i * block_size)
+    return index
+
+def _find_block(data, start, index, block_size):
+    """First (position, old offset) at or after start where a full block of data matches an old block"""
+    n = len(data)
+    if n - start < block_size or not index:
+        return None
+    pos = start
+    weak = zlib.adler32(data[pos:pos + block_size])
+    a, b = weak & 0xffff, weak >> 16
+    while True:
+        candidates = index.get(weak)
+        if candidates:
+            offset = candidates.get(_strong(data[pos:pos + block_size]))
+            if offset is not None:
+                return pos, offset
+        if pos + block_size >= n:
+            return None
+        out, new = data[pos], data[pos + block_size]
+        a = (a - out + new) % ADLER_MOD
+        b = (b - block_size * out + a - 1) % ADLER_MOD
+        weak = (b << 16) | a
+        pos += 1
+
+def _match_rolling(data, index, block_size, writer):
+    pos = 0
+    while True:
+        found = _find_block(data, pos, index, block_size)
+        if found is None:
+            break
+        match, offset = found
+        writer.data(data[pos:match])
+        writer.copy(offset, block_size)
+        pos = match + block_size
+    writer.data(data[pos:])
+
+def _match_aligned(f, start, end, index, block_size, writer):
+    """Match on block boundaries, rolling over a short window only where a run of matches breaks"""
+    pos = start
+    matched = False
+    while pos < end:
+        f.seek(pos)
+        block = f.read(min(block_size, end - pos))
+        if not block:
+            break
+        offset = None
+        if len(block) == block_size:
+            candidates = index.get(zlib.adler32(block))
+            if candidates:
+                offset = candidates.get(_strong(block))
+        if offset is not None:
+            writer.copy(offset, block_size)
+            pos += block_size
+            matched = True
+            continue
+        if matched:
+            # An insertion or deletion shifts everything after it; look for the next old block nearby
+            matched = False
+            window = block + f.read(min(RESYNC_BLOCKS * block_size, end - pos) - len(block))
+            found = _find_block(window, 1, index, block_size)
+            if found is not None:
+                writer.data(window[:found[0]])
+                pos += found[0]
+                continue
+        writer.data(block)
+        pos += len(block)
+
+def _copy_literal(f, start, end, writer):
+    f.seek(start)
+    while start < end:
+        chunk = f.read(min(LITERAL_CHUNK, end - start))
+        if not chunk:
+            break
+        writer.data(chunk)
+        start += len(chunk)
+
+def _diff_region(f, start, end, index, block_size, writer):
+    if end <= start:
+        return
+    if end - start > ROLLING_LIMIT:
+        _match_aligned(f, start, end, index, block_size, writer)
+    else:
+        f.seek(start)
+        _match_rolling(f.read(end - start), index, block_size, writer)
+
+def _diff_file(path, old_entry, new_entry, block_size, writer):
+    index = _block_index(old_entry, block_size)
+    # (start, stop, old offset) to copy, or (start, stop, None) to store as literal data
+    segments = []
+    if old_entry and old_entry.get("zip") and new_entry.get("zip"):
+        old_data = {(m[1], m[2], m[3], m[5]): m[4] for m in old_entry["zip"]}
+        old_content = {(m[1], m[3]) for m in old_entry["zip"]}
+        for name, crc, csize, size, offset, digest in new_entry["zip"]:
+            if not csize:
+                continue
+            old_offset = old_data.get((crc, csize, size, digest))
+            if old_offset is not None:
+                # Same compressed bytes, possibly under another name: copy them whole
+                segments.append((offset, offset + csize, old_offset))
+            elif (crc, size) not in old_content:
+                # New content cannot match anything in the old file
+                segments.append((offset, offset + csize, None))
+    elif not old_entry:
+        segments.append((0, new_entry["size"], None))
+    with open(path, "rb") as f:
+        pos = 0
+        for start, stop, old_offset in segments:
+            _diff_region(f, pos, start, index, block_size, writer)
+            if old_offset is None:
+                _copy_literal(f, start, stop, writer)
+            else:
+                writer.copy(old_offset, stop - start)
+            pos = stop
+        _diff_region(f, pos, new_entry["size"], index, block_size, writer)
+    writer.end()
+
+def create_patch(old_manifest, new_dir, patch_path, previous=None):
+    """Write a patch turning the export described by old_manifest into new_dir; returns stats.
+
+    previous is an earlier manifest of new_dir whose unchanged entries are reused.
+    """
+    block_size = old_manifest["block_size"]
+    new_manifest = build_manifest(new_dir, previous, block_size)
+    old_files = old_manifest["files"]
+    new_files = new_manifest["files"]
+    changed = [rel for rel, entry in sorted(new_files.items())
+               if rel not in old_files or old_files[rel]["sha256"] != entry["sha256"]]
+    header = {
+        "block_size": block_size,
+        "files": [{"path": rel,
+                   "old_sha256": old_files[rel]["sha256"] if rel in old_files else None,
+                   "new_sha256": new_files[rel]["sha256"],
+                   "size": new_files[rel]["size"],
+                   "mode": new_files[rel].get("mode")} for rel in changed],
+        "removed": sorted(set(old_files) - set(new_files)),
+    }
+    stats = {"files": len(changed), "removed": len(header["removed"]), "copied": 0, "literal": 0}
+    with span("patch create") as s, open(patch_path, "wb") as f:
+        encoded = json.dumps(header).encode("utf-8")
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        for rel in changed:
+            writer = _OpWriter(f)
+            _diff_file(os.path.join(new_dir, *rel.split("/")), old_files.get(rel), new_files[rel], block_size, writer)
+            stats["copied"] += writer.copied
+            stats["literal"] += writer.literal_bytes
+        stats["patch_size"] = f.tell()
+        s.add_bytes(stats["patch_size"])
+    return stats
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _read_exact(f, n):
+    data = f.read(n)
+    if len(data) != n:
+        raise PatchError("Patch file is truncated")
+    return data
+
+def _rebuild(patch, old_path, tmp_path):
+    """Run one file's ops from the patch stream; returns the SHA-256 of the result"""
+    sha = hashlib.sha256()
+    old = open(old_path, "rb") if old_path else None
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                op = _read_exact(patch, 1)
+                if op == b"E":
+                    break
+                if op == b"C":
+                    if old is None:
+                        raise PatchError("Copy op for a file without a previous version")
+                    offset, length = struct.unpack("<QQ", _read_exact(patch, 16))
+                    old.seek(offset)
+                    while length:
+                        chunk = old.read(min(length, 1 << 20))
+                        if not chunk:
+                            raise PatchError(f"Copy past the end of {old_path}")
+                        out.write(chunk)
+                        sha.update(chunk)
+                        length -= len(chunk)
+                elif op == b"D":
+                    raw_len, packed_len = struct.unpack("<II", _read_exact(patch, 8))
+                    chunk = zlib.decompress(_read_exact(patch, packed_len))
+                    if len(chunk) != raw_len:
+                        raise PatchError("Corrupt literal data in patch")
+                    out.write(chunk)
+                    sha.update(chunk)
+                else:
+                    raise PatchError(f"Unknown patch op {op!r}")
+    finally:
+        if old:
+            old.close()
+    return sha.hexdigest()
+
+def _target_path(root, rel):
+    """Join a patch path onto root, rejecting absolute paths and anything that resolves outside root"""
+    if not isinstance(rel, str) or not rel or "\\" in rel or rel.startswith("/") \
+            or os.path.isabs(rel) or os.path.splitdrive(rel)[0]:
+        raise PatchError(f"Unsafe path in patch: {rel!r}")
+    path = os.path.normpath(os.path.join(root, *rel.split("/")))
+    real = os.path.realpath(path)
+    if real == root or os.path.commonpath([root, real]) != root:
+        raise PatchError(f"Unsafe path in patch: {rel!r}")
+    return path
+
+def apply_patch(patch_path, target_dir):
+    """Apply a patch to target_dir, verifying every input and output; returns the number of files written"""
+    with span("patch apply"), open(patch_path, "rb") as patch:
+        if _read_exact(patch, len(MAGIC)) != MAGIC:
+            raise PatchError(f"{patch_path} is not a HeartCore patch")
+        (header_len,) = struct.unpack("<I", _read_exact(patch, 4))
+        header = json.loads(_read_exact(patch, header_len).decode("utf-8"))
+
+        # Every path must stay inside target_dir; check them all before touching anything
+        root = os.path.realpath(target_dir)
+        paths = {entry["path"]: _target_path(root, entry["path"]) for entry in header["files"]}
+        removed = [_target_path(root, rel) for rel in header["removed"]]
+
+        # Check every base file before writing anything
+        for entry in header["files"]:
+            if entry["old_sha256"]:
+                path = paths[entry["path"]]
+                if not os.path.exists(path):
+                    raise PatchError(f"{entry['path']} is missing from {target_dir}")
+                if _file_sha256(path) != entry["old_sha256"]:
+                    raise PatchError(f"{entry['path']} does not match the version this patch was made for")
+
+        written = []
+        try:
+            for entry in header["files"]:
+                path = paths[entry["path"]]
+                tmp_path = path + TEMP_SUFFIX
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                written.append((tmp_path, path, entry))
+                actual = _rebuild(patch, path if entry["old_sha256"] else None, tmp_path)
+                if actual != entry["new_sha256"]:
+                    raise PatchError(f"Patched {entry['path']} failed verification")
+        except BaseException:
+            for tmp_path, _, _ in written:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise
+
+        for tmp_path, path, entry in written:
+            if entry.get("mode"):
+                os.chmod(tmp_path, entry["mode"])
+            os.replace(tmp_path, path)
+        for path in removed:
+            if os.path.exists(path):
+                os.remove(path)
+    return len(written)
+
+def _load_or_build(path):
+    if os.path.isdir(path):
+        return build_manifest(path)
+    return load_manifest(path)
+
+def _latest_manifest(output_dir):
+    history = list_manifests(output_dir)
+    if not history:
+        return None
+    try:
+        return load_manifest(history[-1])
+    except (OSError, PatchError, ValueError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manifests and delta patches between HeartCore exports.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("manifest", help="record a new manifest of an export folder")
+    p.add_argument("export_dir")
+    p.add_argument("--label", help="name for the manifest, such as the exported version")
+    p.add_argument("-o", "--output", help="manifest path (default: a new file in <export_dir>.manifests)")
+    p = sub.add_parser("diff", help="create a patch from an old export to a new one")
+    p.add_argument("old", help="manifest of the previous export, or the previous export folder")
+    p.add_argument("new_dir", help="folder of the new export")
+    p.add_argument("-o", "--output", required=True, help="patch file to write")
+    p = sub.add_parser("apply", help="apply a patch to an installed export")
+    p.add_argument("patch")
+    p.add_argument("target_dir")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "manifest":
+            path = write_manifest(args.export_dir, args.output, args.label)
+            print(f"Manifest written to {path}")
+        elif args.command == "diff":
+            if os.path.isdir(args.old) and os.path.samefile(args.old, args.new_dir):
+                raise PatchError("The old and new export are the same folder")
+            if os.path.exists(args.output) and os.path.samefile(args.output, args.old):
+                raise PatchError("The patch would overwrite the old manifest")
+            old_manifest = _load_or_build(args.old)
+            stats = create_patch(old_manifest, args.new_dir, args.output, _latest_manifest(args.new_dir))
+            print(f"{stats['files']} files changed, {stats['removed']} removed; "
+                  f"{stats['copied'] / (1 << 20):.2f} MB reused, {stats['literal'] / (1 << 20):.2f} MB new; "
+                  f"patch is {stats['patch_size'] / (1 << 20):.2f} MB")
+        else:
+            count = apply_patch(args.patch, args.target_dir)
+            print(f"Patched {count} files in {args.target_dir}")
+    except (PatchError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
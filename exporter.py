@@ -0,0 +1,232 @@
+"""Export pipeline shared by the GUI and headless tools (benchmarks, scripts).
+
+Nothing in here touches wx. Messages the user should see are passed to the
+``notify(level, title, message)`` callback, where level is "warning" or "info".
+"""
+import os
+import shutil
+
+from catalog import get_catalog
+from tracing import span, traced
+
+WINDOWS_DLLS = ['SDL2.dll', 'OpenAL32.dll', 'love.dll', 'lua51.dll', 'mpg123.dll', 'msvcp120.dll', 'msvcr120.dll']
+
+@traced("metadata load")
+def read_project_meta(project_path):
+    """Return the parsed .heartproj of a project, or None if it has none"""
+    import yaml
+    proj_name = os.path.basename(project_path)
+    heartproj_path = os.path.join(project_path, f"{proj_name}.heartproj")
+    if not os.path.exists(heartproj_path):
+        return None
+    with open(heartproj_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+def pack_love(project_path, love_path):
+    """Zip a project folder into a .love file, leaving out project metadata"""
+    import zipfile
+    with span("pack", project=os.path.basename(project_path)) as s:
+        with zipfile.ZipFile(love_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for root, dirs, files in os.walk(project_path):
+                for file in files:
+                    if file.endswith('.heartproj'):  # Skip project metadata
+                        continue
+                    file_path = os.path.join(root, file)
+                    arcname = os.path.relpath(file_path, project_path)
+                    zipf.write(file_path, arcname)
+            s.set(members=len(zipf.infolist()))
+        s.add_bytes(os.path.getsize(love_path))
+
+def fuse_executable(love_exe, love_path, output_exe):
+    """Append a .love archive to the love executable"""
+    with span("fuse") as s:
+        with open(output_exe, 'wb') as out:
+            for part in (love_exe, love_path):
+                with open(part, 'rb') as f:
+                    shutil.copyfileobj(f, out, 1024 * 1024)
+            s.add_bytes(out.tell())
+
+def copy_project_libs(project_path, target_os, dest_path, catalog=None):
+    """Copy required libraries for the target OS to the destination folder"""
+    project_data = read_project_meta(project_path)
+    if not project_data:
+        return
+    libs = project_data.get('libs', [])
+    if not libs:
+        return
+
+    # Copy each library's files
+    catalog = catalog or get_catalog()
+    with span("lib copy", target=target_os) as s:
+        for lib in libs:
+            for lib_file in catalog.lib_files(lib, target_os):
+                shutil.copy2(lib_file.path, os.path.join(dest_path, lib_file.name))
+                s.add_bytes(lib_file.size)
+
+def copy_runtime_files(runtime_files, dest_for):
+    """Copy catalog runtime files into the folder dest_for(name) picks for each"""
+    with span("runtime copy") as s:
+        for runtime_file in runtime_files:
+            shutil.copy2(runtime_file.path, os.path.join(dest_for(runtime_file.name), runtime_file.name))
+            s.add_bytes(runtime_file.size)
+
+@traced("assemble:Windows")
+def export_windows(project, export_data, love_path, temp_dir, love_version, catalog):
+    # Get Love2D runtime from app directory
+    if not catalog.has_runtime(love_version, 'windows'):
+        raise Exception(f"Love2D runtime files not found for version {love_version} on Windows. Please ensure the runtime files are in the 'runtimes/{love_version}/windows' directory.")
+
+    # Copy Love2D runtime files to temp directory
+    copy_runtime_files(catalog.runtime_files(love_version, 'windows'), lambda name: temp_dir)
+
+    # Create fused executable
+    love_exe = os.path.join(temp_dir, "love.exe")
+    output_exe = os.path.join(export_data['output_dir'], f"{project['name']}.exe")
+    fuse_executable(love_exe, love_path, output_exe)
+
+    # Copy required DLLs to output directory
+    for dll in WINDOWS_DLLS:
+        src = os.path.join(temp_dir, dll)
+        if os.path.exists(src):
+            shutil.copy2(src, os.path.join(export_data['output_dir'], dll))
+
+    # Copy project libraries
+    copy_project_libs(project['path'], 'Windows', export_data['output_dir'], catalog)
+
+@traced("assemble:MacOS")
+def export_macos(project, export_data, love_path, temp_dir, love_version, catalog):
+    # Get Love2D runtime from app directory
+    if not catalog.has_runtime(love_version, 'macos'):
+        raise Exception(f"Love2D runtime files not found for version {love_version} on MacOS. Please ensure the runtime files are in the 'runtimes/{love_version}/macos' directory.")
+
+    # Create .app structure
+    app_name = f"{project['name']}.app"
+    app_path = os.path.join(export_data['output_dir'], app_name)
+    contents_path = os.path.join(app_path, "Contents")
+    resources_path = os.path.join(contents_path, "Resources")
+    macos_path = os.path.join(contents_path, "MacOS")
+
+    os.makedirs(resources_path, exist_ok=True)
+    os.makedirs(macos_path, exist_ok=True)
+
+    # Copy .love file
+    shutil.copy2(love_path, os.path.join(resources_path, "game.love"))
+
+    # Create Info.plist
+    plist_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+    <key>CFBundleIdentifier</key>
+    <string>{export_data['bundle_id']}</string>
+    <key>CFBundleName</key>
+    <string>{project['name']}</string>
+    <key>CFBundleDisplayName</key>
+    <string>{project['name']}</string>
+    <key>CFBundleVersion</key>
+    <string>{export_data['version']}</string>
+    <key>CFBundleShortVersionString</key>
+    <string>{export_data['version']}</string>
+    <key>CFBundlePackageType</key>
+    <string>APPL</string>
+    <key>CFBundleSignature</key>
+    <string>LOVE</string>
+    <key>CFBundleExecutable</key>
+    <string>love</string>
+    <key>NSHighResolutionCapable</key>
+    <true/>
+</dict>
+</plist>'''
+
+    with open(os.path.join(contents_path, "Info.plist"), 'w') as f:
+        f.write(plist_content)
+
+    # Copy Love2D binary and libraries
+    copy_runtime_files(catalog.runtime_files(love_version, 'macos'),
+                       lambda name: macos_path if name == 'love' else resources_path)
+
+    # Copy project libraries
+    copy_project_libs(project['path'], 'MacOS', resources_path, catalog)
+
+@traced("assemble:Linux")
+def export_linux(project, export_data, love_path, temp_dir, love_version, catalog, notify=None):
+    # Get Love2D runtime from app directory
+    if not catalog.has_runtime(love_version, 'linux'):
+        raise Exception(f"Love2D runtime files not found for version {love_version} on Linux. Please ensure the runtime files are in the 'runtimes/{love_version}/linux' directory.")
+
+    # Create AppDir structure
+    appimage_dir = os.path.join(export_data['output_dir'], "AppDir")
+    os.makedirs(appimage_dir, exist_ok=True)
+
+    # Create .desktop file
+    desktop_content = f'''[Desktop Entry]
+Name={project['name']}
+Exec=love %f
+Type=Application
+Categories=Game;
+Comment={export_data.get('description', '')}
+'''
+    with open(os.path.join(appimage_dir, f"{project['name']}.desktop"), 'w') as f:
+        f.write(desktop_content)
+
+    # Copy .love file
+    shutil.copy2(love_path, os.path.join(appimage_dir, "game.love"))
+
+    # Copy Love2D runtime files
+    copy_runtime_files(catalog.runtime_files(love_version, 'linux'), lambda name: appimage_dir)
+
+    # Copy project libraries
+    copy_project_libs(project['path'], 'Linux', appimage_dir, catalog)
+
+    # Note: Full AppImage creation would require additional tools and configuration
+    if notify:
+        notify("info", "Linux Export", "Linux export created basic AppDir structure. Full AppImage creation requires additional setup.")
+
+@traced("export")
+def export_project(project, export_data, catalog=None, notify=None):
+    """Pack a project into a .love and lay out the export for export_data['platform']"""
+    catalog = catalog or get_catalog()
+
+    # Read project metadata to get Love2D version
+    project_data = read_project_meta(project['path'])
+    if project_data is None:
+        raise Exception("Project metadata file (.heartproj) not found")
+    love_version = project_data.get('love_version')
+    if not love_version:
+        raise Exception("Love2D version not specified in project metadata")
+
+    # Create temp directory for build process
+    temp_dir = os.path.join(export_data['output_dir'], 'temp_build')
+    os.makedirs(temp_dir, exist_ok=True)
+
+    try:
+        # Create .love file
+        love_path = os.path.join(temp_dir, f"{project['name']}.love")
+        pack_love(project['path'], love_path)
+
+        # Platform-specific export
+        platform = export_data['platform']
+        if not catalog.has_runtime(love_version, platform):
+            if notify:
+                notify("warning", "Export Warning", f"Warning: No runtime found for {platform} ({love_version}) in runtimes folder. Export will skip copying the runtime.")
+            # Still copy .love and libs, but skip runtime
+            shutil.copy2(love_path, os.path.join(export_data['output_dir'], f"{project['name']}.love"))
+            copy_project_libs(project['path'], platform, export_data['output_dir'], catalog)
+        elif platform == 'Windows':
+            export_windows(project, export_data, love_path, temp_dir, love_version, catalog)
+        elif platform == 'MacOS':
+            export_macos(project, export_data, love_path, temp_dir, love_version, catalog)
+        elif platform == 'Linux':
+            export_linux(project, export_data, love_path, temp_dir, love_version, catalog, notify)
+    finally:
+        # Clean up temp directory
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    # Record content hashes so a later export can ship as a delta patch
+    from delta_patch import write_manifest
+    try:
+        write_manifest(export_data['output_dir'], label=export_data.get('version'))
+    except OSError as e:
+        if notify:
+            notify("warning", "Export Warning", f"The export was written, but its manifest for delta patches could not be saved: {str(e)}")
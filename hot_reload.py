@@ -0,0 +1,485 @@
+"""Dev-mode runs: watch a project's content and hot-swap changes into the running game.
+
+HeartCore builds a small overlay directory next to the project that links every
+entry of the game's content folder, adds a Lua agent and a boot ``main.lua``
+that starts the agent before handing over to the game's own ``main.lua``.
+The agent connects back to HeartCore over a localhost socket. When files change,
+Lua modules are pushed over the socket and re-``require``d in place; other
+assets are announced so the game can reload them from its ``heartcore.hooks``.
+
+Wire protocol (one header line per frame, tab separated):
+
+    HeartCore -> agent:  RELOAD <path> <size>\\n<size bytes of source>
+                         ASSET <path> 0\\n
+                         REMOVE <path> 0\\n
+    agent -> HeartCore:  HELLO <version>\\n
+                         OK <path> <ms>\\n
+                         ERR <path> <message>\\n
+"""
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+from love_runner import find_love_executable
+
+AGENT_MODULE = "heartcore_agent"
+GAME_MAIN = "heartcore_game_main.lua"
+PROTOCOL_VERSION = "1"
+
+AGENT_SOURCE = r'''-- HeartCore dev-mode agent. Generated for hot reload, do not edit.
+local socket = require("socket")
+
+local agent = {hooks = {}, buffer = ""}
+
+local function module_name(path)
+    local name = path:gsub("%.lua$", ""):gsub("/init$", ""):gsub("/", ".")
+    return name
+end
+
+local function reply(line)
+    if agent.client then
+        agent.client:send(line .. "\n")
+    end
+end
+
+function agent.start(port)
+    local client = socket.tcp()
+    client:settimeout(2)
+    local ok, err = client:connect("127.0.0.1", port)
+    if not ok then
+        print("[heartcore] agent could not connect: " .. tostring(err))
+        return
+    end
+    client:settimeout(0)
+    agent.client = client
+    reply("HELLO\t__VERSION__")
+end
+
+function agent.install()
+    -- Keep our poll in front of whatever love.update the game defines
+    if love.update ~= agent.update then
+        agent.game_update = love.update
+        love.update = agent.update
+    end
+end
+
+function agent.update(dt)
+    agent.poll()
+    if agent.game_update then
+        return agent.game_update(dt)
+    end
+end
+
+local function reload_main(path, source)
+    local chunk, err = (loadstring or load)(source, "@" .. path)
+    if not chunk then
+        return false, err
+    end
+    local ok, run_err = pcall(chunk)
+    if not ok then
+        return false, run_err
+    end
+    agent.install()
+    return true
+end
+
+function agent.reload_module(path, source)
+    if path == "main.lua" then
+        return reload_main(path, source)
+    end
+    if path == "conf.lua" then
+        return false, "conf.lua changes need a restart"
+    end
+    local name = module_name(path)
+    local chunk, err = (loadstring or load)(source, "@" .. path)
+    if not chunk then
+        return false, err
+    end
+    local old = package.loaded[name]
+    local state
+    if type(old) == "table" and type(old.__heartcore_save) == "function" then
+        state = old.__heartcore_save()
+    end
+    if agent.hooks.before_reload then
+        agent.hooks.before_reload(name, old)
+    end
+    local ok, new = pcall(chunk, name)
+    if not ok then
+        return false, new
+    end
+    if new == nil then
+        new = true
+    end
+    -- Swap in place so modules holding a reference to the old table see the new code
+    if type(old) == "table" and type(new) == "table" then
+        for k, v in pairs(new) do
+            old[k] = v
+        end
+        setmetatable(old, getmetatable(new))
+        new = old
+    end
+    package.loaded[name] = new
+    if type(new) == "table" and type(new.__heartcore_load) == "function" and state ~= nil then
+        new.__heartcore_load(state)
+    end
+    if agent.hooks.after_reload then
+        agent.hooks.after_reload(name, new)
+    end
+    return true
+end
+
+local function handle(kind, path, payload)
+    local started = love.timer.getTime()
+    local ok, err = true, nil
+    if kind == "RELOAD" then
+        ok, err = agent.reload_module(path, payload)
+    elseif kind == "ASSET" then
+        if agent.hooks.on_asset then
+            ok, err = pcall(agent.hooks.on_asset, path)
+        end
+    elseif kind == "REMOVE" then
+        if agent.hooks.on_remove then
+            ok, err = pcall(agent.hooks.on_remove, path)
+        end
+    end
+    if ok then
+        reply(string.format("OK\t%s\t%.3f", path, (love.timer.getTime() - started) * 1000))
+    else
+        reply("ERR\t" .. path .. "\t" .. tostring(err):gsub("[\t\n]", " "))
+    end
+end
+
+function agent.poll()
+    local client = agent.client
+    if not client then
+        return
+    end
+    local data, err, partial = client:receive(65536)
+    data = data or partial
+    if data and #data > 0 then
+        agent.buffer = agent.buffer .. data
+    end
+    if err == "closed" then
+        agent.client = nil
+    end
+    while true do
+        local eol = agent.buffer:find("\n", 1, true)
+        if not eol then
+            return
+        end
+        local kind, path, size = agent.buffer:sub(1, eol - 1):match("^(%u+)\t(.-)\t(%d+)$")
+        size = tonumber(size) or 0
+        if #agent.buffer < eol + size then
+            return
+        end
+        local payload = agent.buffer:sub(eol + 1, eol + size)
+        agent.buffer = agent.buffer:sub(eol + size + 1)
+        if kind then
+            handle(kind, path, payload)
+        end
+    end
+end
+
+return agent
+'''.replace("__VERSION__", PROTOCOL_VERSION)
+
+BOOT_MAIN_SOURCE = '''-- HeartCore dev-mode boot file. Generated for hot reload, do not edit.
+heartcore = require("{agent}")
+heartcore.start({port})
+love.filesystem.load("{game_main}")()
+heartcore.install()
+'''
+
+def get_content_dir(project_path):
+    """Return the folder holding the game's main.lua for a project"""
+    content_path = os.path.join(project_path, 'content')
+    if os.path.isfile(os.path.join(content_path, 'main.lua')):
+        return content_path
+    return project_path
+
+class ContentWatcher:
+    """Poll a directory tree and report changed files once edits settle"""
+
+    def __init__(self, root, on_change, interval=0.2, debounce=0.3):
+        self.root = root
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+        self.files = self.snapshot()
+        self.pending = {}
+        self.last_change = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self):
+        """Map every file under root to its (mtime_ns, size)"""
+        files = {}
+        stack = [self.root]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    st = entry.stat()
+                    rel = os.path.relpath(entry.path, self.root).replace(os.sep, '/')
+                    files[rel] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    def poll(self):
+        """Check for changes once; returns the settled batch or an empty list"""
+        now = time.monotonic()
+        current = self.snapshot()
+        for rel, stamp in current.items():
+            previous = self.files.get(rel)
+            if previous is None:
+                self.pending[rel] = 'added'
+                self.last_change = now
+            elif previous != stamp:
+                self.pending.setdefault(rel, 'modified')
+                self.last_change = now
+        for rel in self.files:
+            if rel not in current:
+                self.pending[rel] = 'removed'
+                self.last_change = now
+        self.files = current
+        if not self.pending or now - self.last_change < self.debounce:
+            return []
+        batch = sorted(self.pending.items())
+        self.pending = {}
+        self.on_change(batch, now)
+        return batch
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="heartcore-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+def _link_or_copy(src, dst):
+    """Symlink src to dst, copying instead where symlinks are not allowed"""
+    try:
+        os.symlink(src, dst, target_is_directory=os.path.isdir(src))
+        return True
+    except (OSError, NotImplementedError):
+        if os.path.isdir(src):
+            shutil.copytree(src, dst)
+        else:
+            shutil.copy2(src, dst)
+        return False
+
+def build_overlay(content_dir, overlay_dir, port):
+    """Populate overlay_dir with the game's content, the agent and the boot main.lua.
+
+    Returns True when the overlay is made of symlinks, False when files had to be copied.
+    """
+    linked = True
+    for name in os.listdir(content_dir):
+        target = GAME_MAIN if name == 'main.lua' else name
+        linked = _link_or_copy(os.path.join(content_dir, name), os.path.join(overlay_dir, target)) and linked
+    with open(os.path.join(overlay_dir, f"{AGENT_MODULE}.lua"), "w", encoding="utf-8") as f:
+        f.write(AGENT_SOURCE)
+    with open(os.path.join(overlay_dir, "main.lua"), "w", encoding="utf-8") as f:
+        f.write(BOOT_MAIN_SOURCE.format(agent=AGENT_MODULE, port=port, game_main=GAME_MAIN))
+    return linked
+
+class DevSession:
+    """Run a project with the hot-reload agent and push content changes into it.
+
+    on_reload(path, ok, latency_ms, message) is called from a worker thread for
+    every acknowledged change; latency is measured from the moment the change
+    was detected to the agent's reply. on_exit() is called when the game closes.
+    Pass launch=False to drive the session with StubAgent instead of love.
+    """
+
+    def __init__(self, project_path, on_reload=None, on_exit=None, launch=True,
+                 interval=0.2, debounce=0.3):
+        self.project_path = project_path
+        self.content_dir = get_content_dir(project_path)
+        self.on_reload = on_reload
+        self.on_exit = on_exit
+        self.launch = launch
+        self.interval = interval
+        self.debounce = debounce
+        self.overlay_dir = None
+        self.linked = True
+        self.process = None
+        self.port = None
+        self.connected = threading.Event()
+        self._server = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._sent = {}
+        self._watcher = None
+        self._stopped = False
+
+    def start(self):
+        try:
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.bind(('127.0.0.1', 0))
+            self._server.listen(1)
+            self.port = self._server.getsockname()[1]
+            self.overlay_dir = tempfile.mkdtemp(prefix="heartcore-dev-")
+            self.linked = build_overlay(self.content_dir, self.overlay_dir, self.port)
+            threading.Thread(target=self._accept, name="heartcore-agent", daemon=True).start()
+            self._watcher = ContentWatcher(self.content_dir, self._on_change, self.interval, self.debounce)
+            self._watcher.start()
+            if self.launch:
+                self.process = subprocess.Popen([find_love_executable(), self.overlay_dir])
+                threading.Thread(target=self._wait, name="heartcore-game", daemon=True).start()
+        except BaseException:
+            # Don't leave the socket, threads and overlay behind when the game cannot start
+            self.stop()
+            raise
+        return self
+
+    def stop(self):
+        if self._stopped:
+            return
+        self._stopped = True
+        if self._watcher is not None:
+            self._watcher.stop()
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+        for sock in (self._conn, self._server):
+            if sock is not None:
+                try:
+                    # shutdown() wakes a thread blocked in accept(), close() alone does not
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+        if self.overlay_dir and os.path.isdir(self.overlay_dir):
+            shutil.rmtree(self.overlay_dir, ignore_errors=True)
+
+    def _wait(self):
+        self.process.wait()
+        self.stop()
+        if self.on_exit:
+            self.on_exit()
+
+    def _accept(self):
+        try:
+            conn, _ = self._server.accept()
+        except OSError:
+            return
+        self._conn = conn
+        reader = conn.makefile('r', encoding='utf-8', newline='\n')
+        try:
+            for line in reader:
+                self._handle_reply(line.rstrip('\n').split('\t', 2))
+        except (OSError, ValueError):
+            pass
+
+    def _handle_reply(self, fields):
+        kind = fields[0]
+        if kind == 'HELLO':
+            self.connected.set()
+            return
+        if kind not in ('OK', 'ERR') or len(fields) < 3:
+            return
+        path = fields[1]
+        with self._lock:
+            detected = self._sent.pop(path, None)
+        latency_ms = (time.monotonic() - detected) * 1000 if detected is not None else 0.0
+        if self.on_reload:
+            self.on_reload(path, kind == 'OK', latency_ms, fields[2])
+
+    def _sync_overlay(self, rel, kind):
+        """Mirror a change into the overlay where it is not already visible through a link"""
+        if self.linked:
+            # Anything below a linked top-level entry shows up through the link;
+            # new top-level files and directories need a link of their own
+            first = rel.split('/')[0]
+            dst = os.path.join(self.overlay_dir, GAME_MAIN if first == 'main.lua' else first)
+            src = os.path.join(self.content_dir, first)
+            if os.path.lexists(dst):
+                if kind == 'removed' and first == rel:
+                    os.remove(dst)
+            elif kind != 'removed' and os.path.exists(src):
+                _link_or_copy(src, dst)
+            return
+        target = GAME_MAIN if rel == 'main.lua' else rel
+        dst = os.path.join(self.overlay_dir, *target.split('/'))
+        if kind == 'removed':
+            if os.path.lexists(dst):
+                os.remove(dst)
+        else:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(os.path.join(self.content_dir, *rel.split('/')), dst)
+
+    def _on_change(self, batch, detected):
+        for rel, kind in batch:
+            try:
+                self._sync_overlay(rel, kind)
+            except OSError:
+                pass
+            if kind == 'removed':
+                self.send('REMOVE', rel, b'', detected)
+            elif rel.endswith('.lua'):
+                try:
+                    with open(os.path.join(self.content_dir, *rel.split('/')), 'rb') as f:
+                        payload = f.read()
+                except OSError:
+                    continue
+                self.send('RELOAD', rel, payload, detected)
+            else:
+                self.send('ASSET', rel, b'', detected)
+
+    def send(self, kind, path, payload=b'', detected=None):
+        """Send one frame to the agent; returns False if no agent is connected"""
+        conn = self._conn
+        if conn is None or not self.connected.is_set():
+            return False
+        with self._lock:
+            self._sent[path] = detected if detected is not None else time.monotonic()
+        header = f"{kind}\t{path}\t{len(payload)}\n".encode('utf-8')
+        try:
+            conn.sendall(header + payload)
+        except OSError:
+            return False
+        return True
+
+class StubAgent:
+    """Minimal stand-in for the Lua agent that acknowledges every frame"""
+
+    def __init__(self, port):
+        self.frames = []
+        self.received = threading.Event()
+        self._sock = socket.create_connection(('127.0.0.1', port))
+        self._sock.sendall(f"HELLO\t{PROTOCOL_VERSION}\n".encode('utf-8'))
+        self._thread = threading.Thread(target=self._run, name="heartcore-stub-agent", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        reader = self._sock.makefile('rb')
+        while True:
+            header = reader.readline()
+            if not header:
+                return
+            kind, path, size = header.decode('utf-8').rstrip('\n').split('\t')
+            payload = reader.read(int(size))
+            self.frames.append((kind, path, payload))
+            self._sock.sendall(f"OK\t{path}\t0.000\n".encode('utf-8'))
+            self.received.set()
+
+    def close(self):
+        self._sock.close()
@@ -0,0 +1,212 @@
+"""Size and composition report for exported .love archives.
+
+Only the zip central directory is read, never member data, so multi-GB
+archives are analyzed in the time it takes to read their index. Duplicate
+content is found by matching the CRC-32 and size recorded for every member.
+
+Accepts a .love file, a fused executable (the .love is appended to it) or an
+export folder, in which case the game archive inside it is located.
+
+    python love_analyzer.py exports/MyGame/windows
+    python love_analyzer.py new/MyGame.love --compare old/MyGame.love
+"""
+import os
+import sys
+import json
+import argparse
+import zipfile
+
+from tracing import traced
+
+# Formats that are already compressed; deflating them wastes export time
+INCOMPRESSIBLE_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ogg', '.oga', '.mp3', '.m4a', '.aac',
+    '.opus', '.flac', '.mp4', '.webm', '.ogv', '.zip', '.love', '.gz', '.bz2', '.xz', '.7z',
+}
+# Formats that usually shrink a lot under deflate
+COMPRESSIBLE_EXTENSIONS = {
+    '.lua', '.txt', '.json', '.xml', '.csv', '.glsl', '.frag', '.vert', '.svg', '.tmx',
+    '.tsx', '.md', '.ini', '.cfg', '.yaml', '.yml', '.wav', '.bmp', '.tga', '.ttf', '.otf', '.fnt',
+}
+# Deflated members that kept at least this share of their size did not compress
+INCOMPRESSIBLE_RATIO = 0.97
+# Ignore tiny members when flagging compression choices
+MIN_FLAG_SIZE = 4096
+GAME_ARCHIVE_NAMES = ('game.love',)
+
+def find_archive(path):
+    """Return the archive to analyze for a file or an export folder"""
+    if os.path.isfile(path):
+        return path
+    candidates = []
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            full = os.path.join(root, name)
+            if name in GAME_ARCHIVE_NAMES or name.endswith('.love'):
+                return full
+            if name.endswith('.exe') and zipfile.is_zipfile(full):
+                candidates.append(full)
+    if candidates:
+        return candidates[0]
+    raise FileNotFoundError(f"No .love archive or fused executable found in {path}")
+
+def _extension(name):
+    ext = os.path.splitext(name)[1].lower()
+    return ext or '(none)'
+
+def _directory(name, depth):
+    parts = name.split('/')[:-1]
+    return '/'.join(parts[:depth]) or '.'
+
+def _add(groups, key, info):
+    row = groups.setdefault(key, {'count': 0, 'size': 0, 'compressed': 0})
+    row['count'] += 1
+    row['size'] += info.file_size
+    row['compressed'] += info.compress_size
+
+@traced("analyze")
+def analyze(path, depth=1, top=20):
+    """Build a size report for an archive or export folder"""
+    archive = find_archive(path)
+    by_dir = {}
+    by_ext = {}
+    members = {}
+    by_content = {}
+    incompressible_deflated = []
+    compressible_stored = []
+    total = {'count': 0, 'size': 0, 'compressed': 0}
+
+    with zipfile.ZipFile(archive) as z:
+        infos = [i for i in z.infolist() if not i.is_dir()]
+    for info in infos:
+        name = info.filename
+        ext = _extension(name)
+        _add(by_dir, _directory(name, depth), info)
+        _add(by_ext, ext, info)
+        total['count'] += 1
+        total['size'] += info.file_size
+        total['compressed'] += info.compress_size
+        members[name] = {'size': info.file_size, 'compressed': info.compress_size,
+                         'method': 'deflate' if info.compress_type == zipfile.ZIP_DEFLATED else
+                                   'store' if info.compress_type == zipfile.ZIP_STORED else str(info.compress_type)}
+        if info.file_size:
+            by_content.setdefault((info.CRC, info.file_size), []).append(name)
+        if info.file_size < MIN_FLAG_SIZE:
+            continue
+        if info.compress_type == zipfile.ZIP_DEFLATED and (
+                ext in INCOMPRESSIBLE_EXTENSIONS or info.compress_size >= info.file_size * INCOMPRESSIBLE_RATIO):
+            incompressible_deflated.append(name)
+        elif info.compress_type == zipfile.ZIP_STORED and ext in COMPRESSIBLE_EXTENSIONS:
+            compressible_stored.append(name)
+
+    duplicates = []
+    for (crc, size), names in by_content.items():
+        if len(names) > 1:
+            wasted = sum(members[n]['compressed'] for n in names) - max(members[n]['compressed'] for n in names)
+            duplicates.append({'crc': f"{crc:08x}", 'size': size, 'members': sorted(names), 'wasted': wasted})
+    duplicates.sort(key=lambda d: d['wasted'], reverse=True)
+
+    largest = sorted(members, key=lambda n: members[n]['compressed'], reverse=True)[:top]
+    return {
+        'archive': archive,
+        'archive_size': os.path.getsize(archive),
+        'total': total,
+        'by_dir': by_dir,
+        'by_ext': by_ext,
+        'largest': [dict(members[n], name=n) for n in largest],
+        'members': members,
+        'incompressible_deflated': sorted(incompressible_deflated),
+        'compressible_stored': sorted(compressible_stored),
+        'duplicates': duplicates,
+    }
+
+def _delta_rows(old, new):
+    rows = []
+    for key in set(old) | set(new):
+        before = old.get(key, {}).get('compressed', 0)
+        after = new.get(key, {}).get('compressed', 0)
+        if before != after:
+            rows.append({'name': key, 'before': before, 'after': after, 'delta': after - before})
+    rows.sort(key=lambda r: abs(r['delta']), reverse=True)
+    return rows
+
+def diff(old_report, new_report):
+    """Compare two reports by directory, extension and member"""
+    old_members = old_report['members']
+    new_members = new_report['members']
+    return {
+        'old': old_report['archive'],
+        'new': new_report['archive'],
+        'total_delta': new_report['total']['compressed'] - old_report['total']['compressed'],
+        'by_dir': _delta_rows(old_report['by_dir'], new_report['by_dir']),
+        'by_ext': _delta_rows(old_report['by_ext'], new_report['by_ext']),
+        'members': _delta_rows(old_members, new_members),
+        'added': sorted(set(new_members) - set(old_members)),
+        'removed': sorted(set(old_members) - set(new_members)),
+    }
+
+def _mb(n):
+    return f"{n / (1 << 20):10.2f} MB"
+
+def _ratio(row):
+    return f"{row['compressed'] / row['size']:6.1%}" if row['size'] else f"{'':>6}"
+
+def format_report(report, top=20):
+    total = report['total']
+    lines = [
+        f"Archive: {report['archive']} ({_mb(report['archive_size']).strip()} on disk)",
+        f"Members: {total['count']}, {_mb(total['size']).strip()} uncompressed, "
+        f"{_mb(total['compressed']).strip()} compressed ({_ratio(total).strip()})",
+        "",
+        f"{'directory':<40} {'files':>7} {'compressed':>13} {'ratio':>6}",
+    ]
+    for name, row in sorted(report['by_dir'].items(), key=lambda kv: kv[1]['compressed'], reverse=True)[:top]:
+        lines.append(f"{name:<40} {row['count']:>7} {_mb(row['compressed'])} {_ratio(row)}")
+    lines += ["", f"{'extension':<40} {'files':>7} {'compressed':>13} {'ratio':>6}"]
+    for name, row in sorted(report['by_ext'].items(), key=lambda kv: kv[1]['compressed'], reverse=True)[:top]:
+        lines.append(f"{name:<40} {row['count']:>7} {_mb(row['compressed'])} {_ratio(row)}")
+    lines += ["", "Largest members:"]
+    for member in report['largest'][:top]:
+        lines.append(f"  {_mb(member['compressed'])}  {member['method']:<7} {member['name']}")
+    if report['incompressible_deflated']:
+        lines += ["", f"Already-compressed files that were deflated ({len(report['incompressible_deflated'])}):"]
+        lines += [f"  {name}" for name in report['incompressible_deflated'][:top]]
+    if report['compressible_stored']:
+        lines += ["", f"Compressible files that were stored ({len(report['compressible_stored'])}):"]
+        lines += [f"  {name}" for name in report['compressible_stored'][:top]]
+    if report['duplicates']:
+        wasted = sum(d['wasted'] for d in report['duplicates'])
+        lines += ["", f"Duplicate content ({len(report['duplicates'])} groups, {_mb(wasted).strip()} wasted):"]
+        for dup in report['duplicates'][:top]:
+            lines.append(f"  {_mb(dup['wasted'])}  {', '.join(dup['members'])}")
+    return "\n".join(lines)
+
+def format_diff(result, top=20):
+    lines = [f"{result['old']} -> {result['new']}",
+             f"Compressed size change: {result['total_delta'] / (1 << 20):+.2f} MB", ""]
+    for title, key in (("directory", 'by_dir'), ("extension", 'by_ext'), ("member", 'members')):
+        lines.append(f"{title:<50} {'before':>13} {'after':>13} {'change':>13}")
+        for row in result[key][:top]:
+            lines.append(f"{row['name']:<50} {_mb(row['before'])} {_mb(row['after'])} {row['delta'] / (1 << 20):+10.2f} MB")
+        lines.append("")
+    lines.append(f"Added: {len(result['added'])}, removed: {len(result['removed'])}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Break down the size of an exported .love archive.")
+    parser.add_argument("path", help=".love file, fused executable or export folder")
+    parser.add_argument("--compare", metavar="OLD", help="earlier export to diff against")
+    parser.add_argument("--depth", type=int, default=1, help="directory levels to group by")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.path, args.depth, args.top)
+    if args.compare:
+        result = diff(analyze(args.compare, args.depth, args.top), report)
+        print(json.dumps(result, indent=2) if args.json else format_diff(result, args.top))
+    else:
+        print(json.dumps(report, indent=2) if args.json else format_report(report, args.top))
+
+if __name__ == "__main__":
+    sys.exit(main())
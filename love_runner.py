@@ -1,12 +1,18 @@
 import os
-import subprocess
 import sys
+from tracing import span
 
-def run_love_project(path):
+def find_love_executable():
+    """Find the love executable, preferring the one shipped next to HeartCore"""
     # Look for love.exe in the same directory as the executable
     exe_dir = os.path.dirname(sys.executable)
     love_exe = os.path.join(exe_dir, 'love.exe')
     if not os.path.exists(love_exe):
         # Fallback to system path
         love_exe = 'love'
-    subprocess.Popen([love_exe, path]) 
\ No newline at end of file
+    return love_exe
+
+def run_love_project(path):
+    import subprocess
+    with span("launch", path=path):
+        subprocess.Popen([find_love_executable(), path])
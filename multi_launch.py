@@ -0,0 +1,361 @@
+"""Launch several instances of a project for local multiplayer and soak testing.
+
+Arguments and environment values are templates expanded per instance:
+
+    {i}     instance number, starting at 1 (handy as a player id)
+    {n}     number of instances
+    {port}  base port + instance number - 1
+
+Any other text, including braces, is passed through unchanged.
+
+Launches are staggered, each instance can be pinned to its own CPU and given a
+nice level, and while the instances run their CPU usage and resident memory are
+sampled from /proc. The resulting timeline is saved as JSON so runs of two
+builds under the same load can be compared.
+
+    python multi_launch.py path/to/game -n 4 --arg=--port={port} --env PLAYER={i} --base-port 7000 --pin
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import datetime
+import threading
+
+from love_runner import find_love_executable
+from tracing import span
+
+PROC_DIR = "/proc"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+STOP_TIMEOUT = 5
+PLACEHOLDERS = ("{i}", "{n}", "{port}")
+PLACEHOLDER_PATTERN = re.compile(r"\{[A-Za-z_]\w*\}")
+
+def expand(template, i, count, base_port=None):
+    """Fill {i}, {n} and {port} into one argument or environment template"""
+    port = "" if base_port is None else str(base_port + i - 1)
+    return template.replace("{i}", str(i)).replace("{n}", str(count)).replace("{port}", port)
+
+def check_templates(templates, base_port=None):
+    """Raise ValueError for unknown {name} placeholders, or {port} without a base port"""
+    for template in templates:
+        for placeholder in PLACEHOLDER_PATTERN.findall(template):
+            if placeholder not in PLACEHOLDERS:
+                raise ValueError(f"Unknown placeholder {placeholder} in {template!r}; "
+                                 f"use {', '.join(PLACEHOLDERS)}")
+        if "{port}" in template and base_port is None:
+            raise ValueError(f"{template!r} uses {{port}} but no base port is set")
+
+def parse_env(items):
+    """Turn ["NAME=value", ...] into a dict"""
+    env = {}
+    for item in items or ():
+        name, sep, value = item.partition("=")
+        if not sep or not name:
+            raise ValueError(f"Environment values must look like NAME=value, got {item!r}")
+        env[name] = value
+    return env
+
+def can_sample():
+    return os.path.isdir(os.path.join(PROC_DIR, "self"))
+
+class _ProcStat:
+    """Keeps /proc/<pid>/stat and statm open and re-reads them with pread"""
+
+    def __init__(self, pid):
+        self.stat_fd = os.open(os.path.join(PROC_DIR, str(pid), "stat"), os.O_RDONLY)
+        self.statm_fd = os.open(os.path.join(PROC_DIR, str(pid), "statm"), os.O_RDONLY)
+        self.last_ticks = None
+        self.last_time = None
+
+    def read(self):
+        """Return (cpu percent since the previous read or None, rss bytes)"""
+        stat = os.pread(self.stat_fd, 1024, 0)
+        statm = os.pread(self.statm_fd, 256, 0)
+        # The command name may contain spaces, so split after its closing paren
+        fields = stat[stat.rindex(b")") + 2:].split()
+        ticks = int(fields[11]) + int(fields[12])
+        rss = int(statm.split()[1]) * PAGE_SIZE
+        now = time.monotonic()
+        cpu = None
+        if self.last_ticks is not None and now > self.last_time:
+            cpu = (ticks - self.last_ticks) / CLOCK_TICKS / (now - self.last_time) * 100
+        self.last_ticks = ticks
+        self.last_time = now
+        return cpu, rss
+
+    def close(self):
+        for fd in (self.stat_fd, self.statm_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+class LaunchGroup:
+    """N instances of one project, started with a stagger and sampled until they exit"""
+
+    def __init__(self, project_path, count, args=(), env=None, base_port=None, stagger=0.5,
+                 pin=False, nice=None, interval=0.5, log_dir=None, on_exit=None):
+        self.project_path = project_path
+        self.count = count
+        self.args = list(args)
+        self.env = dict(env or {})
+        self.base_port = base_port
+        self.stagger = stagger
+        self.pin = pin
+        self.nice = nice
+        self.interval = interval
+        self.log_dir = log_dir
+        self.on_exit = on_exit
+        self.instances = []
+        self.samples = []
+        self.warnings = []
+        self._procs = []
+        self._stats = []
+        self._logs = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+        self._started_at = None
+        self._cpus = sorted(os.sched_getaffinity(0)) if pin and hasattr(os, "sched_getaffinity") else []
+        if pin and not self._cpus:
+            self.warnings.append("CPU pinning is not supported on this platform")
+
+    def start(self):
+        """Launch the first instance now and the rest from a background thread"""
+        self._started = time.monotonic()
+        self._started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self._launch(1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _launch(self, i):
+        import subprocess
+        argv = [find_love_executable(), self.project_path]
+        argv += [expand(a, i, self.count, self.base_port) for a in self.args]
+        overrides = {name: expand(value, i, self.count, self.base_port) for name, value in self.env.items()}
+        output = None
+        if self.log_dir:
+            os.makedirs(self.log_dir, exist_ok=True)
+            output = open(os.path.join(self.log_dir, f"instance-{i}.log"), "wb")
+            self._logs.append(output)
+        with span("launch", path=self.project_path, instance=i):
+            proc = subprocess.Popen(argv, env=dict(os.environ, **overrides),
+                                    stdout=output, stderr=subprocess.STDOUT if output else None)
+        info = {"index": i, "pid": proc.pid, "argv": argv[1:], "env": overrides,
+                "launched_at": round(time.monotonic() - self._started, 3),
+                "cpu": None, "nice": None, "exited_at": None, "returncode": None}
+        if self._cpus:
+            cpu = self._cpus[(i - 1) % len(self._cpus)]
+            try:
+                os.sched_setaffinity(proc.pid, {cpu})
+                info["cpu"] = cpu
+            except OSError as e:
+                self.warnings.append(f"instance {i}: could not pin to CPU {cpu}: {e}")
+        if self.nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, proc.pid, self.nice)
+                info["nice"] = self.nice
+            except (OSError, AttributeError) as e:
+                self.warnings.append(f"instance {i}: could not set nice {self.nice}: {e}")
+        stat = None
+        if can_sample():
+            try:
+                stat = _ProcStat(proc.pid)
+            except OSError:
+                pass
+        self.instances.append(info)
+        self._procs.append(proc)
+        self._stats.append(stat)
+
+    def _run(self):
+        next_launch = time.monotonic() + self.stagger
+        try:
+            while not self._stop.is_set():
+                if len(self._procs) < self.count and time.monotonic() >= next_launch:
+                    try:
+                        self._launch(len(self._procs) + 1)
+                    except OSError as e:
+                        self.warnings.append(f"instance {len(self._procs) + 1}: launch failed: {e}")
+                        self.count = len(self._procs)
+                    next_launch = time.monotonic() + self.stagger
+                self._sample()
+                if len(self._procs) == self.count and all(info["exited_at"] is not None for info in self.instances):
+                    break
+                wait = self.interval
+                if len(self._procs) < self.count:
+                    wait = min(wait, max(0, next_launch - time.monotonic()))
+                self._stop.wait(wait)
+        finally:
+            for stat in self._stats:
+                if stat:
+                    stat.close()
+            for log in self._logs:
+                log.close()
+            if self.on_exit:
+                self.on_exit()
+
+    def _sample(self):
+        now = round(time.monotonic() - self._started, 3)
+        cpu = []
+        rss = []
+        for k, (proc, stat, info) in enumerate(zip(self._procs, self._stats, self.instances)):
+            value = (None, None)
+            if info["exited_at"] is None and stat:
+                try:
+                    value = stat.read()
+                except (OSError, ValueError, IndexError):
+                    pass
+            if info["exited_at"] is None and proc.poll() is not None:
+                info["exited_at"] = now
+                info["returncode"] = proc.returncode
+                if stat:
+                    stat.close()
+                    self._stats[k] = None
+                value = (None, None)
+            cpu.append(None if value[0] is None else round(value[0], 1))
+            rss.append(value[1])
+        self.samples.append({
+            "t": now,
+            "cpu": cpu,
+            "rss": rss,
+            "total_cpu": round(sum(c for c in cpu if c is not None), 1),
+            "total_rss": sum(r for r in rss if r is not None),
+        })
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Wait for every instance to exit; returns False if timeout ran out first"""
+        if self._thread:
+            self._thread.join(timeout)
+        return not self.running()
+
+    def stop(self):
+        """Terminate all instances and stop sampling"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        for proc in self._procs:
+            if proc.poll() is None:
+                proc.terminate()
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for proc, info in zip(self._procs, self.instances):
+            try:
+                proc.wait(max(0, deadline - time.monotonic()))
+            except Exception:
+                proc.kill()
+                proc.wait()
+            if info["returncode"] is None:
+                info["returncode"] = proc.returncode
+
+    def timeline(self):
+        return {
+            "project": self.project_path,
+            "started": self._started_at,
+            "count": self.count,
+            "interval": self.interval,
+            "stagger": self.stagger,
+            "sampled": can_sample(),
+            "instances": self.instances,
+            "samples": self.samples,
+            "summary": summarize(self.samples, len(self.instances)),
+            "warnings": self.warnings,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.timeline(), f, indent=1)
+
+def summarize(samples, count):
+    """Mean/peak CPU and RSS per instance and for the whole group"""
+    per_instance = []
+    for k in range(count):
+        cpu = [s["cpu"][k] for s in samples if k < len(s["cpu"]) and s["cpu"][k] is not None]
+        rss = [s["rss"][k] for s in samples if k < len(s["rss"]) and s["rss"][k] is not None]
+        per_instance.append({
+            "mean_cpu": round(sum(cpu) / len(cpu), 1) if cpu else None,
+            "peak_cpu": max(cpu) if cpu else None,
+            "mean_rss": sum(rss) // len(rss) if rss else None,
+            "peak_rss": max(rss) if rss else None,
+        })
+    cpu_samples = [s for s in samples if any(c is not None for c in s["cpu"])]
+    return {
+        "duration": samples[-1]["t"] if samples else 0,
+        "instances": per_instance,
+        "mean_total_cpu": round(sum(s["total_cpu"] for s in cpu_samples) / len(cpu_samples), 1) if cpu_samples else None,
+        "peak_total_cpu": max((s["total_cpu"] for s in cpu_samples), default=None),
+        "peak_total_rss": max((s["total_rss"] for s in samples), default=None),
+    }
+
+def _mb(n):
+    return f"{n / (1 << 20):8.1f} MB" if n is not None else f"{'-':>11}"
+
+def _pct(n):
+    return f"{n:7.1f}%" if n is not None else f"{'-':>8}"
+
+def format_summary(timeline):
+    summary = timeline["summary"]
+    lines = [f"{timeline['count']} instances of {timeline['project']}, {summary['duration']:.1f} s",
+             f"{'instance':>8} {'pid':>8} {'mean cpu':>8} {'peak cpu':>8} {'mean rss':>11} {'peak rss':>11} {'exit':>5}"]
+    for info, row in zip(timeline["instances"], summary["instances"]):
+        code = "" if info["returncode"] is None else info["returncode"]
+        lines.append(f"{info['index']:>8} {info['pid']:>8} {_pct(row['mean_cpu'])} {_pct(row['peak_cpu'])} "
+                     f"{_mb(row['mean_rss'])} {_mb(row['peak_rss'])} {code:>5}")
+    lines.append(f"{'total':>8} {'':>8} {_pct(summary['mean_total_cpu'])} {_pct(summary['peak_total_cpu'])} "
+                 f"{'':>11} {_mb(summary['peak_total_rss'])}")
+    lines += [f"warning: {w}" for w in timeline["warnings"]]
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run several instances of a Love2D project and sample their resource use.")
+    parser.add_argument("path", help="project folder or .love file")
+    parser.add_argument("-n", "--count", type=int, default=2, help="number of instances")
+    parser.add_argument("--arg", action="append", default=[], help="argument passed to every instance, e.g. --arg=--port={port} (templated, repeatable)")
+    parser.add_argument("--env", action="append", default=[], help="NAME=value set for every instance (templated, repeatable)")
+    parser.add_argument("--base-port", type=int, help="port of instance 1; {port} counts up from here")
+    parser.add_argument("--stagger", type=float, default=0.5, help="seconds between launches")
+    parser.add_argument("--pin", action="store_true", help="pin each instance to its own CPU")
+    parser.add_argument("--nice", type=int, help="nice level for the instances")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between resource samples")
+    parser.add_argument("--duration", type=float, help="stop the instances after this many seconds")
+    parser.add_argument("--logs", metavar="DIR", help="write each instance's output to DIR/instance-<i>.log")
+    parser.add_argument("--output", "-o", help="save the resource timeline as JSON")
+    args = parser.parse_args(argv)
+
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    try:
+        env = parse_env(args.env)
+        check_templates(args.arg + list(env.values()), args.base_port)
+    except ValueError as e:
+        parser.error(str(e))
+    if not can_sample():
+        print("No /proc on this platform; CPU and memory will not be sampled.", file=sys.stderr)
+
+    group = LaunchGroup(args.path, args.count, args.arg, env, args.base_port, args.stagger,
+                        args.pin, args.nice, args.interval, args.logs)
+    try:
+        group.start()
+    except OSError as e:
+        print(f"Launch failed: {e}", file=sys.stderr)
+        return 1
+    try:
+        group.wait(args.duration)
+    except KeyboardInterrupt:
+        pass
+    group.stop()
+
+    timeline = group.timeline()
+    print(format_summary(timeline))
+    if args.output:
+        group.save(args.output)
+        print(f"Timeline written to {args.output}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import os
 import sys
 import json
+import datetime
+from tracing import span, traced
 
 # Save projects.json in the same folder as the app executable
 if getattr(sys, 'frozen', False):
@@ -11,15 +13,20 @@ else:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECTS_FILE = os.path.join(BASE_DIR, "projects.json")
 
-def load_projects():
-    if not os.path.exists(PROJECTS_FILE):
+@traced("registry load")
+def load_projects(path=None):
+    path = path or PROJECTS_FILE
+    if not os.path.exists(path):
         return []
-    with open(PROJECTS_FILE, "r", encoding="utf-8") as f:
+    with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def save_projects(projects):
-    with open(PROJECTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(projects, f, indent=2)
+def save_projects(projects, path=None):
+    path = path or PROJECTS_FILE
+    with span("registry save", projects=len(projects)) as s:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(projects, f, indent=2)
+            s.add_bytes(f.tell())
 
 def add_project(project):
     projects = load_projects()
@@ -30,4 +37,21 @@ def remove_project(index):
     projects = load_projects()
     if 0 <= index < len(projects):
         projects.pop(index)
-        save_projects(projects) 
\ No newline at end of file
+        save_projects(projects)
+
+def scan_projects(root, projects):
+    """Find folders under root containing a main.lua that are not in projects yet"""
+    known = {p["path"] for p in projects}
+    found = []
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with span("scan", root=root) as s:
+        for dirpath, dirnames, filenames in os.walk(root):
+            if "main.lua" in filenames and dirpath not in known:
+                known.add(dirpath)
+                found.append({
+                    "name": os.path.basename(dirpath),
+                    "path": dirpath,
+                    "last_edited": now
+                })
+        s.set(found=len(found))
+    return found
@@ -0,0 +1,174 @@
+"""Download, verify and cache the Love2D runtimes bundled into HeartCore builds.
+
+Archives are streamed to disk in chunks, resumed with HTTP Range requests when a
+previous download was interrupted, checked against a pinned SHA-256 and kept in
+a content-addressed cache (``<cache>/<sha[:2]>/<sha>``). Pins come from the
+``sha256`` key of a platform entry or, failing that, from ``runtimes.lock.json``.
+A URL without a pin is refused with MissingPinError unless ``pin_new`` is set,
+in which case it is downloaded from its upstream URL and its digest is recorded
+in the lock file, which should then be reviewed and committed. Once an archive
+is cached, later builds need no network at all.
+
+``mirror`` replaces the host part of every URL (the archive file name is kept),
+so a local HTTP server can stand in for GitHub. Mirrored downloads must match an
+existing pin; they are never used to create one. ``offline`` forbids any network
+access and fails if a runtime is not cached yet.
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from tracing import traced
+
+CACHE_DIR = os.path.join("build", "runtime-cache")
+LOCK_FILE = "runtimes.lock.json"
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = 60
+
+class FetchError(Exception):
+    pass
+
+class MissingPinError(FetchError):
+    """No SHA-256 is pinned for a URL and none may be recorded for this download"""
+
+_lock_file_lock = threading.Lock()
+
+def load_lock(lock_file=LOCK_FILE):
+    if not os.path.exists(lock_file):
+        return {}
+    with open(lock_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _record_pin(url, sha256, lock_file):
+    with _lock_file_lock:
+        pins = load_lock(lock_file)
+        pins[url] = sha256
+        with open(lock_file, "w", encoding="utf-8") as f:
+            json.dump(pins, f, indent=2, sort_keys=True)
+
+def cache_path(cache_dir, sha256):
+    return os.path.join(cache_dir, sha256[:2], sha256)
+
+def resolve_url(url, mirror=None):
+    if not mirror:
+        return url
+    return mirror.rstrip("/") + "/" + url.rsplit("/", 1)[-1]
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+@traced("runtime download")
+def download(url, dest):
+    """Stream url into dest, resuming from a partial dest if the server allows it.
+
+    Returns the SHA-256 of the complete file.
+    """
+    import requests
+
+    h = hashlib.sha256()
+    offset = 0
+    if os.path.exists(dest):
+        with open(dest, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                offset += len(chunk)
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with requests.get(url, headers=headers, stream=True, timeout=TIMEOUT) as r:
+        if r.status_code == 416:
+            # Partial file is already complete
+            return h.hexdigest()
+        r.raise_for_status()
+        if offset and r.status_code != 206:
+            # Server ignored the range, start over
+            h = hashlib.sha256()
+            offset = 0
+        with open(dest, "ab" if offset else "wb") as f:
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+                h.update(chunk)
+    return h.hexdigest()
+
+def fetch(url, sha256=None, cache_dir=CACHE_DIR, lock_file=LOCK_FILE, offline=False, mirror=None,
+          pin_new=False):
+    """Return the path of the verified, cached archive for url"""
+    expected = sha256 or load_lock(lock_file).get(url)
+    if expected:
+        cached = cache_path(cache_dir, expected)
+        if os.path.exists(cached):
+            return cached
+    if offline:
+        raise FetchError(f"{url} is not in the runtime cache and offline mode is enabled")
+    if not expected and mirror:
+        raise MissingPinError(f"{url} has no pinned SHA-256; a mirror download cannot be used to pin it")
+    if not expected and not pin_new:
+        raise MissingPinError(f"{url} has no pinned SHA-256 in {lock_file}; "
+                         "download it from upstream with pin_new to record one")
+
+    partial_dir = os.path.join(cache_dir, "partial")
+    os.makedirs(partial_dir, exist_ok=True)
+    partial = os.path.join(partial_dir, url.rsplit("/", 1)[-1] + ".part")
+    actual = download(resolve_url(url, mirror), partial)
+    if expected and actual != expected:
+        os.remove(partial)
+        raise FetchError(f"Checksum mismatch for {url}: expected {expected}, got {actual}")
+
+    cached = cache_path(cache_dir, actual)
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    os.replace(partial, cached)
+    if not expected:
+        print(f"Pinned {url} to sha256 {actual} in {lock_file}")
+        _record_pin(url, actual, lock_file)
+    return cached
+
+def fetch_all(platforms, jobs=None, **kwargs):
+    """Fetch every platform archive concurrently; returns {platform: cached path}"""
+    with ThreadPoolExecutor(max_workers=jobs or len(platforms) or 1) as pool:
+        futures = {name: pool.submit(fetch, info["url"], info.get("sha256"), **kwargs)
+                   for name, info in platforms.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def _extract_member(z, member, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    mode = member.external_attr >> 16
+    if stat.S_ISLNK(mode):
+        # Framework symlinks inside love.app
+        if os.path.lexists(dst):
+            os.remove(dst)
+        os.symlink(z.read(member).decode("utf-8"), dst)
+        return
+    with z.open(member) as src, open(dst, "wb") as out:
+        shutil.copyfileobj(src, out, CHUNK_SIZE)
+    if mode & 0o777:
+        os.chmod(dst, mode & 0o777)
+
+@traced("runtime staging")
+def stage_runtime(platform, info, archive, plat_dir):
+    """Lay out one platform's runtime in plat_dir straight from the cached archive"""
+    os.makedirs(plat_dir, exist_ok=True)
+    if not info["extract"]:
+        # Copy AppImage directly
+        appimage_path = os.path.join(plat_dir, info["url"].rsplit("/", 1)[-1])
+        shutil.copyfile(archive, appimage_path)
+        os.chmod(appimage_path, 0o755)
+        return
+    with zipfile.ZipFile(archive) as z:
+        for member in z.infolist():
+            if member.is_dir():
+                continue
+            name = member.filename
+            if platform == "windows":
+                # Extract love.exe and all .dll files flat into plat_dir
+                if name.endswith("love.exe") or name.endswith(".dll"):
+                    _extract_member(z, member, os.path.join(plat_dir, os.path.basename(name)))
+            elif platform == "macos":
+                # Extract the love.app folder
+                if name.startswith("love.app/"):
+                    _extract_member(z, member, os.path.join(plat_dir, *name.split("/")))
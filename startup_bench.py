@@ -0,0 +1,90 @@
+"""Measure HeartCore's time-to-first-frame for the script and both frozen layouts.
+
+Each run launches HeartCore with HEARTCORE_STARTUP_PROBE pointing at a temp file.
+The app writes the time of its first paint there and closes itself, so the
+measured time covers interpreter start, imports, bundle unpacking and window
+creation. Layouts that have not been built are skipped.
+
+    python startup_bench.py --runs 10 --json startup.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+from build import APP_NAME, dist_layout, host_target
+
+def candidates(target_os):
+    """Return {layout: command} for every launchable HeartCore layout"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    exe_name = APP_NAME + (".exe" if sys.platform == "win32" else "")
+    layouts = {"script": [sys.executable, os.path.join(here, "app.py")]}
+    for layout in ("onefile", "onedir"):
+        _, app_dir = dist_layout(target_os, layout)
+        exe = os.path.join(here, app_dir, exe_name)
+        if os.path.isfile(exe):
+            layouts[layout] = [exe]
+    return layouts
+
+def measure(cmd, timeout):
+    """Launch cmd once and return seconds from spawn to first paint"""
+    fd, probe = tempfile.mkstemp(prefix="heartcore-startup-")
+    os.close(fd)
+    os.remove(probe)
+    env = dict(os.environ, HEARTCORE_STARTUP_PROBE=probe)
+    started = time.time()
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    try:
+        with open(probe, "r", encoding="utf-8") as f:
+            first_frame = float(f.read())
+    except (OSError, ValueError):
+        return None
+    finally:
+        if os.path.exists(probe):
+            os.remove(probe)
+    return first_frame - started
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HeartCore time-to-first-frame.")
+    parser.add_argument("--runs", type=int, default=5, help="measured launches per layout")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured launches per layout (fills OS caches)")
+    parser.add_argument("--target", default=host_target(), help="dist/<target> to look for frozen builds in")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for one launch")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for layout, cmd in candidates(args.target).items():
+        for _ in range(args.warmup):
+            measure(cmd, args.timeout)
+        samples = [measure(cmd, args.timeout) for _ in range(args.runs)]
+        samples = [s for s in samples if s is not None]
+        if not samples:
+            print(f"{layout:<8} no frame recorded ({' '.join(cmd)})")
+            continue
+        results[layout] = {
+            "command": cmd,
+            "samples": samples,
+            "min": min(samples),
+            "median": statistics.median(samples),
+            "max": max(samples),
+        }
+        print(f"{layout:<8} min {min(samples) * 1000:8.1f} ms  median {statistics.median(samples) * 1000:8.1f} ms  "
+              f"max {max(samples) * 1000:8.1f} ms  ({len(samples)} runs)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"platform": platform.platform(), "python": sys.version, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import os
+
+from catalog import Catalog
+
+def test_missing_or_file_roots_are_empty_until_created(tmp_path):
+    runtimes, libs = tmp_path / "runtimes", tmp_path / "libs"
+    runtimes.write_text("not a folder")
+    catalog = Catalog(str(runtimes), str(libs))
+    assert catalog.runtime_versions() == []
+    assert catalog.libs() == []
+
+    os.remove(str(runtimes))
+    os.makedirs(str(runtimes / "11.5" / "linux"))
+    os.makedirs(str(libs / "steam" / "windows"))
+    (libs / "steam" / "windows" / "steam_api64.dll").write_bytes(b"dll")
+    assert catalog.runtime_versions() == ["11.5"]
+    assert catalog.has_runtime("11.5", "Linux")
+    assert catalog.missing_libs(["steam"], "Linux") == ["steam"]
+    assert [f.name for f in catalog.lib_files("steam", "Windows")] == ["steam_api64.dll"]
@@ -0,0 +1,131 @@
+import filecmp
+import os
+import random
+import shutil
+import zipfile
+
+import pytest
+
+import delta_patch
+from delta_patch import PatchError, apply_patch, create_patch, list_manifests, load_manifest, write_manifest
+
+def make_export(folder, version):
+    """A fused executable, a .love, a large runtime file and a per-version extra file"""
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(7)
+    assets = [rng.randbytes(150000) for _ in range(12)]
+    love = os.path.join(folder, "game.love")
+    with zipfile.ZipFile(love, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("main.lua", f"VERSION = {version}\n" * 200)
+        for i, data in enumerate(assets):
+            z.writestr(f"assets/sfx{i}.ogg", data)
+        if version > 1:
+            z.writestr("assets/music.ogg", random.Random(version).randbytes(400000))
+    stub = random.Random(1).randbytes(300000)
+    with open(love, "rb") as src, open(os.path.join(folder, "game.exe"), "wb") as out:
+        out.write(stub + src.read())
+    runtime = bytearray(random.Random(2).randbytes(3 * 1024 * 1024))
+    if version > 1:
+        runtime[1500000:1500000] = b"patched in" * 20
+    with open(os.path.join(folder, "love.dll"), "wb") as f:
+        f.write(runtime)
+    with open(os.path.join(folder, f"notes-v{version}.txt"), "w") as f:
+        f.write(f"release {version}\n")
+
+def test_round_trip(tmp_path):
+    old, new, installed = str(tmp_path / "old"), str(tmp_path / "new"), str(tmp_path / "installed")
+    make_export(old, 1)
+    make_export(new, 2)
+    shutil.copytree(old, installed)
+    old_manifest = load_manifest(write_manifest(old, label="1.0.0"))
+
+    stats = create_patch(old_manifest, new, str(tmp_path / "1-to-2.hcpatch"))
+    assert stats["files"] == 4 and stats["removed"] == 1
+    # The new music is the bulk of the patch; unchanged assets and runtime blocks are reused
+    assert stats["copied"] > 2 * stats["literal"]
+    assert stats["patch_size"] < 2 * 400000 + 200000
+
+    assert apply_patch(str(tmp_path / "1-to-2.hcpatch"), installed) == 4
+    assert sorted(os.listdir(installed)) == sorted(os.listdir(new))
+    for name in os.listdir(new):
+        assert filecmp.cmp(os.path.join(installed, name), os.path.join(new, name), shallow=False)
+
+    # The installed copy no longer matches the base version, so a second run is refused untouched
+    with pytest.raises(PatchError, match="does not match"):
+        apply_patch(str(tmp_path / "1-to-2.hcpatch"), installed)
+
+def test_manifests_are_never_replaced(tmp_path):
+    out = str(tmp_path / "windows")
+    make_export(out, 1)
+    first = write_manifest(out, label="1.0.0")
+    make_export(out, 2)
+    second = write_manifest(out, label="1.0.0")
+    assert first != second
+    assert list_manifests(out) == [first, second]
+    assert load_manifest(first)["files"]["game.love"] != load_manifest(second)["files"]["game.love"]
+    with pytest.raises(FileExistsError):
+        write_manifest(out, path=first)
+
+def test_cli_diff_against_earlier_manifest_of_same_folder(tmp_path, capsys):
+    out = str(tmp_path / "windows")
+    make_export(out, 1)
+    first = write_manifest(out, label="1.0.0")
+    installed = str(tmp_path / "installed")
+    shutil.copytree(out, installed)
+    shutil.rmtree(out)
+    make_export(out, 2)
+    write_manifest(out, label="1.1.0")
+
+    patch = str(tmp_path / "update.hcpatch")
+    assert delta_patch.main(["diff", first, out, "-o", patch]) == 0
+    assert "4 files changed, 1 removed" in capsys.readouterr().out
+    assert delta_patch.main(["apply", patch, installed]) == 0
+    assert sorted(os.listdir(installed)) == sorted(os.listdir(out))
+
+    assert delta_patch.main(["diff", out, out, "-o", patch]) == 1
+    assert delta_patch.main(["diff", first, out, "-o", first]) == 1
+
+def write_raw_patch(path, files, removed, data=b"owned\n"):
+    """A hand-made patch whose every file is one literal block of data"""
+    import hashlib, json, struct, zlib
+    header = {"block_size": delta_patch.BLOCK_SIZE, "removed": removed,
+              "files": [{"path": rel, "old_sha256": None, "new_sha256": hashlib.sha256(data).hexdigest(),
+                         "size": len(data), "mode": None} for rel in files]}
+    encoded = json.dumps(header).encode("utf-8")
+    packed = zlib.compress(data)
+    with open(path, "wb") as f:
+        f.write(delta_patch.MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        for _ in files:
+            f.write(b"D" + struct.pack("<II", len(data), len(packed)) + packed + b"E")
+
+@pytest.mark.parametrize("files, removed", [
+    (["../escaped.txt"], []),
+    (["ok.txt", "assets/../../escaped.txt"], []),
+    ([os.path.abspath("/tmp/escaped.txt")], []),
+    (["ok.txt"], ["../victim.txt"]),
+    (["ok.txt"], ["/etc/hostname"]),
+])
+def test_paths_outside_target_are_rejected(tmp_path, files, removed):
+    target = tmp_path / "install"
+    target.mkdir()
+    victim = tmp_path / "victim.txt"
+    victim.write_text("keep me")
+    patch = str(tmp_path / "evil.hcpatch")
+    write_raw_patch(patch, files, removed)
+    with pytest.raises(PatchError, match="Unsafe path"):
+        apply_patch(patch, str(target))
+    assert os.listdir(str(target)) == []
+    assert not (tmp_path / "escaped.txt").exists()
+    assert victim.read_text() == "keep me"
+
+def test_symlink_out_of_target_is_rejected(tmp_path):
+    target = tmp_path / "install"
+    target.mkdir()
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    os.symlink(str(outside), str(target / "link"))
+    patch = str(tmp_path / "evil.hcpatch")
+    write_raw_patch(patch, ["link/escaped.txt"], [])
+    with pytest.raises(PatchError, match="Unsafe path"):
+        apply_patch(patch, str(target))
+    assert os.listdir(str(outside)) == []
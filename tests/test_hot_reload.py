@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from hot_reload import DevSession, StubAgent
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def test_dev_session_with_stub_agent(tmp_path):
+    content = tmp_path / "content"
+    write(str(content / "main.lua"), b"require('player')\n")
+    write(str(content / "player.lua"), b"return {}\n")
+    reloads = []
+    session = DevSession(str(tmp_path), on_reload=lambda *args: reloads.append(args),
+                         launch=False, interval=0.05, debounce=0.05).start()
+    agent = StubAgent(session.port)
+    try:
+        assert session.connected.wait(5)
+
+        # Modified module: RELOAD carries the new source
+        write(str(content / "player.lua"), b"return { speed = 200 }\n")
+        assert wait_for(lambda: ("RELOAD", "player.lua", b"return { speed = 200 }\n") in agent.frames)
+
+        # Asset in a new top-level folder: ASSET, and the overlay exposes the folder
+        write(str(content / "sprites" / "hero.png"), b"\x89PNG")
+        assert wait_for(lambda: ("ASSET", "sprites/hero.png", b"") in agent.frames)
+        assert os.path.isfile(os.path.join(session.overlay_dir, "sprites", "hero.png"))
+
+        # Removal: REMOVE
+        os.remove(str(content / "sprites" / "hero.png"))
+        assert wait_for(lambda: ("REMOVE", "sprites/hero.png", b"") in agent.frames)
+
+        # Every acknowledged change reaches on_reload with its latency
+        assert wait_for(lambda: len(reloads) == 3)
+        assert [r[0] for r in reloads] == ["player.lua", "sprites/hero.png", "sprites/hero.png"]
+        for path, ok, latency_ms, message in reloads:
+            assert ok
+            assert 0 <= latency_ms < 5000
+    finally:
+        agent.close()
+        session.stop()
+    assert not os.path.exists(session.overlay_dir)
+
+def test_failed_launch_cleans_up(tmp_path, monkeypatch):
+    import threading
+    import hot_reload
+    write(str(tmp_path / "main.lua"), b"")
+    monkeypatch.setattr(hot_reload, "find_love_executable", lambda: str(tmp_path / "no-such-love"))
+    session = DevSession(str(tmp_path), interval=0.05)
+    with pytest.raises(OSError):
+        session.start()
+    assert not os.path.exists(session.overlay_dir)
+    names = lambda: {t.name for t in threading.enumerate()}
+    assert wait_for(lambda: not names() & {"heartcore-agent", "heartcore-watcher"})
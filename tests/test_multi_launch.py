@@ -0,0 +1,15 @@
+import pytest
+
+from multi_launch import check_templates, expand
+
+def test_expand_leaves_other_braces_alone():
+    assert expand('--config={"player":{i}}', 3, 4, 7000) == '--config={"player":3}'
+    assert expand("--port={port} --of={n}", 2, 4, 7000) == "--port=7001 --of=4"
+    assert expand("{player}", 1, 1) == "{player}"
+
+def test_check_templates():
+    check_templates(['{"x":1}', "--id={i}", "--port={port}"], base_port=7000)
+    with pytest.raises(ValueError, match="Unknown placeholder"):
+        check_templates(["--id={player}"])
+    with pytest.raises(ValueError, match="no base port"):
+        check_templates(["--port={port}"])
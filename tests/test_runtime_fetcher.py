@@ -0,0 +1,95 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from runtime_fetcher import FetchError, cache_path, fetch
+
+URL = "https://github.com/love2d/love/releases/download/11.5/love-11.5-win64.zip"
+ARCHIVE = os.urandom(3 * 1024 * 1024 + 123)
+DIGEST = hashlib.sha256(ARCHIVE).hexdigest()
+
+class MirrorHandler(BaseHTTPRequestHandler):
+    """Serves ARCHIVE under its file name and honours Range requests"""
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get("Range")))
+        if self.path != "/" + URL.rsplit("/", 1)[-1]:
+            self.send_error(404)
+            return
+        start = 0
+        if self.headers.get("Range"):
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            if start >= len(ARCHIVE):
+                self.send_error(416)
+                return
+        body = ARCHIVE[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def mirror():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MirrorHandler)
+    MirrorHandler.requests_seen = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def dirs(tmp_path):
+    return {"cache_dir": str(tmp_path / "cache"), "lock_file": str(tmp_path / "runtimes.lock.json")}
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def test_fresh_download(mirror, dirs):
+    path = fetch(URL, DIGEST, mirror=mirror, **dirs)
+    assert path == cache_path(dirs["cache_dir"], DIGEST)
+    assert read(path) == ARCHIVE
+    assert MirrorHandler.requests_seen == [("/love-11.5-win64.zip", None)]
+
+def test_range_resume(mirror, dirs):
+    partial_dir = os.path.join(dirs["cache_dir"], "partial")
+    os.makedirs(partial_dir)
+    with open(os.path.join(partial_dir, "love-11.5-win64.zip.part"), "wb") as f:
+        f.write(ARCHIVE[:1000000])
+    path = fetch(URL, DIGEST, mirror=mirror, **dirs)
+    assert read(path) == ARCHIVE
+    assert MirrorHandler.requests_seen == [("/love-11.5-win64.zip", "bytes=1000000-")]
+
+def test_checksum_mismatch_removes_partial(mirror, dirs):
+    with pytest.raises(FetchError, match="Checksum mismatch"):
+        fetch(URL, "0" * 64, mirror=mirror, **dirs)
+    assert os.listdir(os.path.join(dirs["cache_dir"], "partial")) == []
+    assert not os.path.exists(cache_path(dirs["cache_dir"], DIGEST))
+
+def test_offline_warm_cache(mirror, dirs):
+    fetch(URL, DIGEST, mirror=mirror, **dirs)
+    MirrorHandler.requests_seen = []
+    assert read(fetch(URL, DIGEST, offline=True, **dirs)) == ARCHIVE
+    assert MirrorHandler.requests_seen == []
+
+def test_offline_cold_cache(dirs):
+    with pytest.raises(FetchError, match="offline"):
+        fetch(URL, DIGEST, offline=True, **dirs)
+
+def test_mirror_never_creates_a_pin(mirror, dirs):
+    with pytest.raises(FetchError, match="mirror"):
+        fetch(URL, mirror=mirror, pin_new=True, **dirs)
+    assert not os.path.exists(dirs["lock_file"])
+    assert MirrorHandler.requests_seen == []
+
+def test_unpinned_url_is_refused(dirs):
+    with pytest.raises(FetchError, match="no pinned SHA-256"):
+        fetch(URL, **dirs)
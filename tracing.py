@@ -0,0 +1,164 @@
+"""Lightweight tracing spans for HeartCore operations.
+
+    with span("pack", project=name) as s:
+        ...
+        s.add_bytes(size)
+
+    @traced("metadata load")
+    def read_project_meta(path): ...
+
+While tracing is disabled, ``span`` returns a shared no-op object and ``traced``
+adds a single flag check, so instrumented code pays next to nothing. Tracing is
+switched on by setting ``HEARTCORE_TRACE=<trace.json>`` (the trace is written and
+a summary printed when the process exits) or from the GUI's Tools menu.
+
+Traces use the Chrome trace-event format and open in chrome://tracing or Perfetto.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+
+_enabled = False
+_events = []
+_lock = threading.Lock()
+_output_path = None
+_origin_ns = time.perf_counter_ns()
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_bytes(self, n):
+        pass
+
+    def set(self, **args):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    __slots__ = ("name", "args", "bytes", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.bytes = 0
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        args = self.args
+        if self.bytes:
+            args["bytes"] = self.bytes
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+        _events.append({
+            "name": self.name,
+            "cat": "heartcore",
+            "ph": "X",
+            "ts": (self.start - _origin_ns) / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+        return False
+
+    def add_bytes(self, n):
+        self.bytes += n
+
+    def set(self, **args):
+        self.args.update(args)
+
+def span(name, **args):
+    """Context manager timing a block; a no-op while tracing is disabled"""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, args)
+
+def traced(name=None):
+    """Decorator wrapping every call of a function in a span"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def is_enabled():
+    return _enabled
+
+def enable(path=None):
+    """Start recording spans; path is where flush() writes the trace"""
+    global _enabled, _output_path
+    with _lock:
+        _output_path = path or _output_path
+        _enabled = True
+
+def disable():
+    global _enabled
+    with _lock:
+        _enabled = False
+
+def reset():
+    """Drop every recorded span"""
+    with _lock:
+        del _events[:]
+
+def write_trace(path):
+    """Write the recorded spans as Chrome trace-event JSON"""
+    with _lock:
+        events = list(_events)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+def summary():
+    """Aggregate spans by name into rows of (name, calls, seconds, bytes), slowest first"""
+    totals = {}
+    with _lock:
+        events = list(_events)
+    for event in events:
+        row = totals.setdefault(event["name"], [0, 0.0, 0])
+        row[0] += 1
+        row[1] += event["dur"] / 1e6
+        row[2] += event["args"].get("bytes", 0)
+    return sorted(((name, calls, seconds, nbytes) for name, (calls, seconds, nbytes) in totals.items()),
+                  key=lambda row: row[2], reverse=True)
+
+def format_summary():
+    lines = [f"{'stage':<28} {'calls':>6} {'seconds':>10} {'MB':>10} {'MB/s':>10}"]
+    for name, calls, seconds, nbytes in summary():
+        mb = nbytes / (1 << 20)
+        rate = f"{mb / seconds:10.1f}" if nbytes and seconds else f"{'':>10}"
+        lines.append(f"{name:<28} {calls:>6} {seconds:10.3f} {mb:10.1f} {rate}")
+    return "\n".join(lines)
+
+def flush():
+    """Write the trace to the configured path and print the summary to stderr"""
+    if not _output_path or not _events:
+        return
+    write_trace(_output_path)
+    print(format_summary(), file=sys.stderr)
+    print(f"Trace written to {_output_path}", file=sys.stderr)
+
+if os.environ.get("HEARTCORE_TRACE"):
+    enable(os.environ["HEARTCORE_TRACE"])
+    atexit.register(flush)